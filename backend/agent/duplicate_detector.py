@@ -1,8 +1,9 @@
 """Duplicate event detection using fuzzy matching."""
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Set
 from datetime import date, timedelta
 from difflib import SequenceMatcher
 import re
+import functools
 
 # Common Ukrainian-English event title mappings for semantic duplicate detection
 SEMANTIC_EQUIVALENTS = {
@@ -20,36 +21,52 @@ SEMANTIC_EQUIVALENTS = {
     "будівництво": ["construction", "building"],
 }
 
+# Common words that don't affect uniqueness
+_STOP_WORDS = frozenset({"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "year"})
+
+
+@functools.lru_cache(maxsize=8192)
+def _normalize_title(title: str) -> str:
+    """Uncached body of DuplicateDetector.normalize_title; titles get compared
+    against many others, so each is normalized once (bounded memo)."""
+    # Convert to lowercase
+    title = title.lower()
+    # Normalize common spelling variations
+    title = title.replace('kreator', 'creator')  # Ukrainian transliteration
+    title = title.replace('-bud', ' bud')  # Normalize separators
+    # Remove extra whitespace
+    title = " ".join(title.split())
+    # Remove common words that don't affect uniqueness
+    words = [w for w in title.split() if w not in _STOP_WORDS]
+    return " ".join(words)
+
 
 class DuplicateDetector:
     """Detects duplicate events using fuzzy matching on title and date."""
     
-    def __init__(self, title_similarity_threshold: float = 0.60, date_tolerance_days: int = 0):
+    def __init__(
+        self,
+        title_similarity_threshold: float = 0.60,
+        date_tolerance_days: int = 0,
+        scorer: Optional[Callable[[str, str], float]] = None
+    ):
         """
         Initialize duplicate detector.
         
         Args:
             title_similarity_threshold: Minimum similarity ratio (0-1) to consider titles similar (default: 0.60 for aggressive duplicate detection)
             date_tolerance_days: Maximum days difference to consider same event (default: 0 = exact match)
+            scorer: Optional similarity function on two normalized titles, returning 0-1 (default: difflib SequenceMatcher ratio)
         """
         self.title_similarity_threshold = title_similarity_threshold
         self.date_tolerance_days = date_tolerance_days
+        self.scorer = scorer
     
     def normalize_title(self, title: str) -> str:
         """Normalize title for comparison (lowercase, remove extra spaces, normalize spelling)."""
         if not title:
             return ""
-        # Convert to lowercase
-        title = title.lower()
-        # Normalize common spelling variations
-        title = title.replace('kreator', 'creator')  # Ukrainian transliteration
-        title = title.replace('-bud', ' bud')  # Normalize separators
-        # Remove extra whitespace
-        title = " ".join(title.split())
-        # Remove common words that don't affect uniqueness
-        stop_words = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "year"}
-        words = [w for w in title.split() if w not in stop_words]
-        return " ".join(words)
+        return _normalize_title(title)
     
     def title_similarity(self, title1: str, title2: str) -> float:
         """Calculate similarity between two titles."""
@@ -59,8 +76,38 @@ class DuplicateDetector:
         if not norm1 or not norm2:
             return 0.0
         
+        if self.scorer is not None:
+            return self.scorer(norm1, norm2)
+        
         # Use SequenceMatcher for similarity
-        return SequenceMatcher(None, norm1, norm2).ratio()
+        return SequenceMatcher(None, norm1, norm2, autojunk=False).ratio()
+    
+    def titles_similar(self, title1: str, title2: str) -> bool:
+        """Check whether title similarity reaches the threshold.
+        
+        The length bound (what real_quick_ratio() computes) and quick_ratio() are
+        cheap upper bounds on ratio(), so most dissimilar pairs are rejected
+        without the full matching pass.
+        """
+        norm1 = self.normalize_title(title1)
+        norm2 = self.normalize_title(title2)
+        
+        if not norm1 or not norm2:
+            return False
+        if norm1 == norm2:
+            return True
+        
+        threshold = self.title_similarity_threshold
+        if self.scorer is not None:
+            return self.scorer(norm1, norm2) >= threshold
+        
+        # Checked before building the matcher, which indexes norm2 up front
+        len1, len2 = len(norm1), len(norm2)
+        if 2.0 * min(len1, len2) / (len1 + len2) < threshold:
+            return False
+        
+        matcher = SequenceMatcher(None, norm1, norm2, autojunk=False)
+        return matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
     
     def is_semantic_duplicate(self, title1: str, title2: str) -> bool:
         """
@@ -137,8 +184,7 @@ class DuplicateDetector:
             return False
         
         # Check title similarity (text-based)
-        similarity = self.title_similarity(title1, title2)
-        if similarity >= self.title_similarity_threshold:
+        if self.titles_similar(title1, title2):
             return True
         
         # Check semantic similarity (Ukrainian/English equivalent)
@@ -147,13 +193,16 @@ class DuplicateDetector:
         
         return False
     
-    def find_duplicates(self, new_events: List[Dict], existing_events: List[Dict]) -> Dict[str, List[Dict]]:
+    def find_duplicates(self, new_events: List[Dict], existing_events: List[Dict],
+                        existing_urls: Optional[Set[str]] = None) -> Dict[str, List[Dict]]:
         """
         Find duplicates between new events and existing events, AND within new events.
         
         Args:
             new_events: List of new event dicts to check
             existing_events: List of existing event dicts from database
+            existing_urls: Optional URLs known to be stored already (e.g. from an
+                exact lookup over the whole table), checked on top of existing_events
             
         Returns:
             Dict with 'duplicates' (list of duplicate new events) and 'unique' (list of unique new events)
@@ -163,7 +212,7 @@ class DuplicateDetector:
         seen_urls = set()  # Track URLs we've already accepted
         
         # Also get URLs from existing events
-        existing_urls = {e.get("url", "") for e in existing_events if e.get("url")}
+        existing_urls = set(existing_urls or ()) | {e.get("url", "") for e in existing_events if e.get("url")}
         
         for new_event in new_events:
             new_url = new_event.get("url", "")
@@ -0,0 +1,8 @@
+"""Keyword matching helpers shared by the agent, database client and cleanup scripts."""
+import re
+from typing import Iterable, Pattern
+
+
+def keyword_matcher(keywords: Iterable[str]) -> Pattern[str]:
+    """Compile literal keywords into one alternation regex (single pass per string)."""
+    return re.compile('|'.join(re.escape(kw) for kw in keywords))
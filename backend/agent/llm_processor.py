@@ -269,11 +269,11 @@ class LLMProcessor:
                 # Extract ALL URLs first
                 all_urls = self.url_extractor.extract_urls_from_html(raw_content, listing_url)
                 # Then filter for event URLs
-                extracted_urls = self.url_extractor.extract_event_urls(raw_content, listing_url)
+                extracted_urls = self.url_extractor.extract_event_urls(raw_content, listing_url, urls=all_urls)
             
             if not all_urls and content:
                 all_urls = self.url_extractor.extract_urls_from_text(content, listing_url)
-                extracted_urls = self.url_extractor.extract_event_urls(content, listing_url)
+                extracted_urls = self.url_extractor.extract_event_urls(content, listing_url, urls=all_urls)
             
             # Prioritize eventdetail URLs
             eventdetail_urls = [url for url in all_urls if 'eventdetail' in url.lower()]
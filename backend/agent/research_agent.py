@@ -11,9 +11,9 @@ from agent.search import SearchAgent
 from agent.llm_processor import LLMProcessor
 from agent.models import Event
 from agent.duplicate_detector import DuplicateDetector
-from agent.url_validator import URLValidator
+from agent.url_validator import URLValidator, install_dns_cache
 from agent.translator import Translator
-from database.client import DatabaseClient
+from database.client import get_db
 
 
 class ResearchAgent:
@@ -22,7 +22,7 @@ class ResearchAgent:
     def __init__(self):
         self.search_agent = SearchAgent()
         self.llm_processor = LLMProcessor()
-        self.db_client = DatabaseClient()
+        self.db_client = get_db()
         self.duplicate_detector = DuplicateDetector(title_similarity_threshold=0.85, date_tolerance_days=0)
         self.url_validator = URLValidator(timeout=5, max_redirects=5)
         self.translator = Translator()
@@ -58,7 +58,8 @@ class ResearchAgent:
             for i, query in enumerate(queries, 1):
                 print(f"[{datetime.now()}] Searching query {i}/{len(queries)}: {query[:50]}...")
                 try:
-                    results = self.search_agent.search(query, max_results=10)
+                    # raw_content (HTML) is needed to extract direct event URLs
+                    results = self.search_agent.search(query, max_results=10, include_raw=True)
                     all_search_results.extend(results)
                     stats["queries_searched"] += 1
                     stats["search_results"] += len(results)
@@ -68,6 +69,7 @@ class ResearchAgent:
                     error_msg = f"Error searching query '{query}': {str(e)}"
                     print(f"[ERROR] {error_msg}")
                     stats["errors"].append(error_msg)
+            self.search_agent.flush_depth_stats()
             
             print(f"[{datetime.now()}] Collected {len(all_search_results)} total search results")
             
@@ -180,7 +182,7 @@ class ResearchAgent:
             
             # Get existing events for duplicate checking (check all events, not just upcoming)
             print(f"[{datetime.now()}] Fetching existing events for duplicate detection...")
-            existing_events = self.db_client.get_all_events(limit=1000)  # Get full event data including URL
+            existing_events = self.db_client.get_all_events_for_duplicate_check(limit=1000)  # Title, date and URL only
             existing_events_dicts = [
                 {
                     "event_title": e.get("event_title", ""),
@@ -194,9 +196,19 @@ class ResearchAgent:
             # Convert events to dicts for duplicate checking
             new_events_dicts = [event.to_dict() for event in all_events]
             
+            # Exact URL matches are looked up across the whole table; the
+            # title/date window above only feeds the fuzzy comparison
+            try:
+                existing_urls = self.db_client.check_existing_urls([e.get("url") for e in new_events_dicts])
+            except Exception as e:
+                print(f"[WARNING] Could not look up existing URLs, using the recent window only: {str(e)}")
+                existing_urls = None
+            
             # Check for duplicates
             print(f"[{datetime.now()}] Checking for duplicates...")
-            duplicate_result = self.duplicate_detector.find_duplicates(new_events_dicts, existing_events_dicts)
+            duplicate_result = self.duplicate_detector.find_duplicates(
+                new_events_dicts, existing_events_dicts, existing_urls=existing_urls
+            )
             unique_events_dicts = duplicate_result["unique"]
             duplicates_count = len(duplicate_result["duplicates"])
             
@@ -265,15 +277,22 @@ class ResearchAgent:
                 except Exception as e:
                     print(f"  ⚠️ Force translation error: {str(e)[:50]}")
             
-            # Save to database
-            for event_dict in valid_events:
-                try:
-                    self.db_client.upsert_event(event_dict)
-                    stats["events_saved"] += 1
-                except Exception as e:
-                    error_msg = f"Error saving event '{event_dict.get('event_title', 'Unknown')}': {str(e)}"
-                    print(f"[ERROR] {error_msg}")
-                    stats["errors"].append(error_msg)
+            # Save to database in bulk; a failed batch is retried row by row inside
+            # upsert_events, so the count reflects what was actually stored
+            try:
+                stats["events_saved"] += len(self.db_client.upsert_events(valid_events, errors=stats["errors"]))
+            except Exception as e:
+                # Preparing (validating/translating) the events failed before anything was
+                # written; save them one by one so a single bad event doesn't lose the rest
+                print(f"[WARNING] Bulk save failed, saving events individually: {str(e)[:80]}")
+                for event_dict in valid_events:
+                    try:
+                        if self.db_client.upsert_event(event_dict):
+                            stats["events_saved"] += 1
+                    except Exception as e:
+                        error_msg = f"Error saving event '{event_dict.get('event_title', 'Unknown')}': {str(e)}"
+                        print(f"[ERROR] {error_msg}")
+                        stats["errors"].append(error_msg)
             
             print(f"[{datetime.now()}] Saved {stats['events_saved']} events to database")
             
@@ -349,5 +368,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # URL validation hits the same hosts many times per run
+    install_dns_cache()
     main()
 
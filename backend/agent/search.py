@@ -1,11 +1,62 @@
 """Web search functionality using Tavily API."""
 import os
-from typing import List, Dict
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import List, Dict, Tuple
 from tavily import TavilyClient
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Search queries by keyword cluster (timeframe: next 6 months)
+_ALL_QUERIES: Tuple[str, ...] = (
+    # Group A: Planning - focus on specific organizations and real event sources
+    "urban planning Ukraine conference 2025 site:ua",
+    "урбаністика Україна конференція 2025",
+    "ro3kvit urban planning events Ukraine",
+    "cities alliance Ukraine urban recovery",
+    
+    # Group B: Recovery - focus on official sources
+    "Ukraine reconstruction conference 2025 site:gov.ua",
+    "відбудова України конференція грудень 2025",
+    "Ukraine recovery forum EU 2025",
+    "rebuild Ukraine conference registration",
+    
+    # Group C: Housing - focus on policy events
+    "housing policy Ukraine forum 2025",
+    "affordable housing conference Ukraine site:eu",
+    "житлова політика форум Україна 2025",
+    
+    # Group D: Governance and capacity building
+    "decentralization Ukraine conference 2025",
+    "municipal governance forum Ukraine",
+    "місцеве самоврядування форум Україна 2025",
+    
+    # Group E: Specific organizations known for real events
+    "UNDP Ukraine urban events 2025",
+    "World Bank Ukraine reconstruction conference",
+    "European Commission Ukraine recovery event",
+    
+    # Group F: Energy and sustainability events
+    "energy week Ukraine 2025",
+    "тиждень енергоефективності Україна 2025",
+    "sustainable energy Ukraine conference",
+    "green reconstruction Ukraine forum",
+    "энергетический форум Украина 2025",
+    
+    # Group G: Infrastructure and construction
+    "infrastructure Ukraine conference 2025",
+    "construction forum Ukraine грудень",
+    "budivelnyk Ukraine congress",
+)
+
+
+# Default Tavily cache location, anchored to backend/ so scripts run from any
+# directory share one cache (override with TAVILY_CACHE_DIR)
+_DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".tavily_cache"
+
 
 class SearchAgent:
     """Agent for searching the web for relevant events."""
@@ -15,6 +66,16 @@ class SearchAgent:
         if not api_key:
             raise ValueError("TAVILY_API_KEY must be set in environment variables")
         self.client = TavilyClient(api_key=api_key)
+        
+        # On-disk result cache so re-runs don't re-hit Tavily for identical queries
+        self._cache_dir = Path(os.getenv("TAVILY_CACHE_DIR", _DEFAULT_CACHE_DIR))
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._ttl = int(os.getenv("TAVILY_CACHE_TTL", "21600"))  # 6 hours
+        
+        # Per-query (good, total) run counts, used to downgrade to "basic" search depth
+        self._depth_stats_path = self._cache_dir / "depth_stats.json"
+        self._depth_stats: Dict[str, Tuple[int, int]] = self._load_depth_stats()
+        self._depth_stats_dirty = False  # Written out by flush_depth_stats()
     
     def get_search_queries(self) -> List[str]:
         """
@@ -23,98 +84,100 @@ class SearchAgent:
         Returns:
             List of search query strings
         """
-        # Timeframe: next 6 months
-        queries = []
-        
-        # Group A: Planning - focus on specific organizations and real event sources
-        planning_keywords = [
-            "urban planning Ukraine conference 2025 site:ua",
-            "урбаністика Україна конференція 2025",
-            "ro3kvit urban planning events Ukraine",
-            "cities alliance Ukraine urban recovery"
-        ]
-        
-        # Group B: Recovery - focus on official sources
-        recovery_keywords = [
-            "Ukraine reconstruction conference 2025 site:gov.ua",
-            "відбудова України конференція грудень 2025",
-            "Ukraine recovery forum EU 2025",
-            "rebuild Ukraine conference registration"
-        ]
-        
-        # Group C: Housing - focus on policy events
-        housing_keywords = [
-            "housing policy Ukraine forum 2025",
-            "affordable housing conference Ukraine site:eu",
-            "житлова політика форум Україна 2025"
-        ]
-        
-        # Group D: Governance and capacity building
-        governance_keywords = [
-            "decentralization Ukraine conference 2025",
-            "municipal governance forum Ukraine",
-            "місцеве самоврядування форум Україна 2025"
-        ]
-        
-        # Group E: Specific organizations known for real events
-        org_keywords = [
-            "UNDP Ukraine urban events 2025",
-            "World Bank Ukraine reconstruction conference",
-            "European Commission Ukraine recovery event"
-        ]
-        
-        # Group F: Energy and sustainability events
-        energy_keywords = [
-            "energy week Ukraine 2025",
-            "тиждень енергоефективності Україна 2025",
-            "sustainable energy Ukraine conference",
-            "green reconstruction Ukraine forum",
-            "энергетический форум Украина 2025"
-        ]
-        
-        # Group G: Infrastructure and construction
-        infrastructure_keywords = [
-            "infrastructure Ukraine conference 2025",
-            "construction forum Ukraine грудень",
-            "budivelnyk Ukraine congress"
-        ]
-        
-        # Combine all keywords
-        all_keywords = planning_keywords + recovery_keywords + housing_keywords + governance_keywords + org_keywords + energy_keywords + infrastructure_keywords
-        
-        return all_keywords
+        return list(_ALL_QUERIES)
     
-    def search(self, query: str, max_results: int = 10) -> List[Dict]:
+    def search(self, query: str, max_results: int = 10, include_raw: bool = False) -> List[Dict]:
         """
         Search the web for a given query.
         
         Args:
             query: Search query string
             max_results: Maximum number of results to return
+            include_raw: Also return the page HTML as raw_content (larger, slower responses)
             
         Returns:
-            List of search results with title, url, and content
+            List of search results with title, url, and content (plus raw_content if requested)
         """
+        key = hashlib.sha256(f"{query}|{max_results}|{include_raw}".encode()).hexdigest()
+        cache_path = self._cache_dir / f"{key}.json"
+        try:
+            if time.time() - cache_path.stat().st_mtime < self._ttl:
+                return json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass  # No (valid) cache entry
+        
+        depth = self._choose_depth(query)
         try:
             response = self.client.search(
                 query=query,
-                search_depth="advanced",  # Using advanced for better results and URL extraction
+                search_depth=depth,
                 max_results=max_results,
                 include_answer=False,
-                include_raw_content=True
+                include_raw_content=include_raw
             )
             
             results = []
             for result in response.get("results", []):
-                results.append({
+                item = {
                     "title": result.get("title", ""),
                     "url": result.get("url", ""),
-                    "content": result.get("content", ""),
-                    "raw_content": result.get("raw_content", "")
-                })
+                    "content": result.get("content", "")
+                }
+                if include_raw:
+                    item["raw_content"] = result.get("raw_content", "")
+                results.append(item)
             
+            content_field = "raw_content" if include_raw else "content"
+            self._record_depth_result(query, any(r[content_field] for r in results))
+            self._write_cache(cache_path, results)
             return results
         except Exception as e:
             print(f"Error searching for query '{query}': {str(e)}")
             return []
-
+    
+    def _write_cache(self, path: Path, results: List[Dict]) -> None:
+        """Atomically write search results to the on-disk cache."""
+        try:
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(results, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(path)
+        except OSError as e:
+            print(f"Warning: could not write search cache: {str(e)}")
+    
+    def _choose_depth(self, query: str) -> str:
+        """
+        Pick the Tavily search depth for a query.
+        
+        "advanced" is slower and costs more; once a query has reliably returned
+        usable content (>= 3 runs, >= 70% good), "basic" is enough.
+        """
+        good, total = self._depth_stats.get(query, (0, 0))
+        if total >= 3 and good / total >= 0.7:
+            return "basic"
+        return "advanced"
+    
+    def _record_depth_result(self, query: str, good: bool) -> None:
+        """Update the per-query depth statistics in memory (see flush_depth_stats)."""
+        prev_good, prev_total = self._depth_stats.get(query, (0, 0))
+        self._depth_stats[query] = (prev_good + int(good), prev_total + 1)
+        self._depth_stats_dirty = True
+    
+    def flush_depth_stats(self) -> None:
+        """Persist the depth statistics once a run's searches are done."""
+        if not self._depth_stats_dirty:
+            return
+        try:
+            tmp = self._depth_stats_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._depth_stats, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self._depth_stats_path)
+            self._depth_stats_dirty = False
+        except OSError as e:
+            print(f"Warning: could not write search depth stats: {str(e)}")
+    
+    def _load_depth_stats(self) -> Dict[str, Tuple[int, int]]:
+        """Load persisted per-query depth statistics."""
+        try:
+            data = json.loads(self._depth_stats_path.read_text(encoding="utf-8"))
+            return {query: (int(good), int(total)) for query, (good, total) in data.items()}
+        except (OSError, ValueError, TypeError):
+            return {}
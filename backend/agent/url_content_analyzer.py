@@ -2,14 +2,61 @@
 import requests
 from typing import Optional, Tuple, Dict
 from datetime import date, datetime
-from urllib.parse import urljoin
 import re
+import functools
 from urllib.parse import urlparse, urljoin
+from lxml import html as lxml_html
+
+# Memoized urljoin
+_cached_urljoin = functools.lru_cache(maxsize=8192)(urljoin)
+
+# Fallback anchor pattern for pages lxml can't parse
+_HREF_RE = re.compile(r'<a[^>]+href=["\']([^"\']+)["\'][^>]*>([^<]*)</a>', re.IGNORECASE | re.DOTALL)
+
+# Month names mapping (English and Ukrainian)
+_MONTH_MAP = {
+    'january': 1, 'січня': 1, 'січень': 1,
+    'february': 2, 'лютого': 2, 'лютий': 2,
+    'march': 3, 'березня': 3, 'березень': 3,
+    'april': 4, 'квітня': 4, 'квітень': 4,
+    'may': 5, 'травня': 5, 'травень': 5,
+    'june': 6, 'червня': 6, 'червень': 6,
+    'july': 7, 'липня': 7, 'липень': 7,
+    'august': 8, 'серпня': 8, 'серпень': 8,
+    'september': 9, 'вересня': 9, 'вересень': 9,
+    'october': 10, 'жовтня': 10, 'жовтень': 10,
+    'november': 11, 'листопада': 11, 'листопад': 11,
+    'december': 12, 'грудня': 12, 'грудень': 12,
+}
+
+# Date patterns use named groups (day, month | month_num, year) so
+# _parse_date_match can dispatch on them directly.
+
+# Dates with time information (indicate event date)
+_TIME_PATTERNS = [
+    re.compile(r'(?P<day>\d{1,2})\s+(?P<month>грудня|грудень|листопада|листопад|січня|січень|лютого|лютий|березня|березень|квітня|квітень|травня|травень|червня|червень|липня|липень|серпня|серпень|вересня|вересень|жовтня|жовтень)\s+(?P<year>\d{4})\s+року,\s+об\s+(\d{1,2}):(\d{2})', re.IGNORECASE),  # "4 грудня 2025 року, об 11:00"
+    re.compile(r'(?P<day>\d{1,2})\s+(?P<month>december|november|january|february|march|april|may|june|july|august|september|october)\s+(?P<year>\d{4}),?\s+at\s+(\d{1,2}):(\d{2})', re.IGNORECASE),  # "4 December 2025, at 11:00"
+    re.compile(r'(?P<day>\d{1,2})\s+(?P<month>грудня|грудень|листопада|листопад)\s+(?P<year>\d{4})\s+року', re.IGNORECASE),  # "4 грудня 2025 року"
+]
+
+# All other date formats
+_DATE_PATTERNS = [
+    re.compile(r'(?P<month>december|грудня|грудень|листопада|листопад|січня|січень|лютого|лютий|березня|березень|квітня|квітень|травня|травень|червня|червень|липня|липень|серпня|серпень|вересня|вересень|жовтня|жовтень)\s+(?P<day>\d{1,2})[-\s]+(\d{1,2}),?\s+(?P<year>\d{4})', re.IGNORECASE),  # December 1-5, 2025
+    re.compile(r'(?P<day>\d{1,2})[-\s]+(\d{1,2})\s+(?P<month>december|грудня|грудень|листопада|листопад)\s+(?P<year>\d{4})', re.IGNORECASE),  # 1-5 December 2025
+    re.compile(r'(?P<month>december|грудня|грудень|листопада|листопад|січня|січень|лютого|лютий|березня|березень|квітня|квітень|травня|травень|червня|червень|липня|липень|серпня|серпень|вересня|вересень|жовтня|жовтень)\s+(?P<day>\d{1,2}),?\s+(?P<year>\d{4})', re.IGNORECASE),  # December 1, 2025
+    re.compile(r'(?P<day>\d{1,2})\s+(?P<month>december|грудня|грудень|листопада|листопад|січня|січень|лютого|лютий|березня|березень|квітня|квітень|травня|травень|червня|червень|липня|липень|серпня|серпень|вересня|вересень|жовтня|жовтень)\s+(?P<year>\d{4})', re.IGNORECASE),  # 1 December 2025
+    re.compile(r'(?P<year>\d{4})-(?P<month_num>\d{2})-(?P<day>\d{2})'),  # 2025-12-01
+    re.compile(r'(?P<day>\d{1,2})\s*[-–]\s*(\d{1,2})\s+(?P<month>грудня|грудень|листопада|листопад)', re.IGNORECASE),  # 01-05 ГРУДНЯ (no year)
+]
+
 
 
 class URLContentAnalyzer:
     """Analyzes URL content to extract event information and validate dates."""
     
+    # Max URLs (ranked by cheap score) that get the content-context scan
+    MAX_CONTEXT_CANDIDATES = 10
+    
     def __init__(self, timeout: int = 5):
         self.timeout = timeout
         self.session = requests.Session()
@@ -17,6 +64,16 @@ class URLContentAnalyzer:
             'User-Agent': 'Mozilla/5.0 (compatible; EventIntelligenceBot/1.0)'
         })
     
+    def fetch_raw(self, url: str) -> str:
+        """Fetch page HTML on demand (e.g. for search results returned without raw_content)."""
+        try:
+            response = self.session.get(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code == 200:
+                return response.text
+        except Exception:
+            pass
+        return ""
+    
     def extract_date_from_content(self, content: str) -> Optional[date]:
         """
         Extract EVENT date from page content.
@@ -63,51 +120,15 @@ class URLContentAnalyzer:
                     return event_date
         
         # If no event date marker found, look for dates with time information (also indicates event date)
-        time_patterns = [
-            r'(\d{1,2})\s+(грудня|грудень|листопада|листопад|січня|січень|лютого|лютий|березня|березень|квітня|квітень|травня|травень|червня|червень|липня|липень|серпня|серпень|вересня|вересень|жовтня|жовтень)\s+(\d{4})\s+року,\s+об\s+(\d{1,2}):(\d{2})',  # "4 грудня 2025 року, об 11:00"
-            r'(\d{1,2})\s+(december|november|january|february|march|april|may|june|july|august|september|october)\s+(\d{4}),?\s+at\s+(\d{1,2}):(\d{2})',  # "4 December 2025, at 11:00"
-            r'(\d{1,2})\s+(грудня|грудень|листопада|листопад)\s+(\d{4})\s+року',  # "4 грудня 2025 року"
-        ]
-        
-        for pattern in time_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                try:
-                    event_date = self._parse_date_match(match, content)
-                    if event_date:
-                        return event_date
-                except (ValueError, IndexError):
-                    continue
+        for pattern in _TIME_PATTERNS:
+            for match in pattern.finditer(content):
+                event_date = self._parse_date_match(match, content)
+                if event_date:
+                    return event_date
         
         # Finally, look for all date patterns but exclude those near publication indicators
-        date_patterns = [
-            r'(december|грудня|грудень|листопада|листопад|січня|січень|лютого|лютий|березня|березень|квітня|квітень|травня|травень|червня|червень|липня|липень|серпня|серпень|вересня|вересень|жовтня|жовтень)\s+(\d{1,2})[-\s]+(\d{1,2}),?\s+(\d{4})',  # December 1-5, 2025
-            r'(\d{1,2})[-\s]+(\d{1,2})\s+(december|грудня|грудень|листопада|листопад)\s+(\d{4})',  # 1-5 December 2025
-            r'(december|грудня|грудень|листопада|листопад|січня|січень|лютого|лютий|березня|березень|квітня|квітень|травня|травень|червня|червень|липня|липень|серпня|серпень|вересня|вересень|жовтня|жовтень)\s+(\d{1,2}),?\s+(\d{4})',  # December 1, 2025
-            r'(\d{1,2})\s+(december|грудня|грудень|листопада|листопад|січня|січень|лютого|лютий|березня|березень|квітня|квітень|травня|травень|червня|червень|липня|липень|серпня|серпень|вересня|вересень|жовтня|жовтень)\s+(\d{4})',  # 1 December 2025
-            r'(\d{4})-(\d{2})-(\d{2})',  # 2025-12-01
-            r'(\d{1,2})\s*[-–]\s*(\d{1,2})\s+(грудня|грудень|листопада|листопад)',  # 01-05 ГРУДНЯ
-        ]
-        
-        # Month names mapping
-        month_map = {
-            'january': 1, 'січня': 1, 'січень': 1,
-            'february': 2, 'лютого': 2, 'лютий': 2,
-            'march': 3, 'березня': 3, 'березень': 3,
-            'april': 4, 'квітня': 4, 'квітень': 4,
-            'may': 5, 'травня': 5, 'травень': 5,
-            'june': 6, 'червня': 6, 'червень': 6,
-            'july': 7, 'липня': 7, 'липень': 7,
-            'august': 8, 'серпня': 8, 'серпень': 8,
-            'september': 9, 'вересня': 9, 'вересень': 9,
-            'october': 10, 'жовтня': 10, 'жовтень': 10,
-            'november': 11, 'листопада': 11, 'листопад': 11,
-            'december': 12, 'грудня': 12, 'грудень': 12,
-        }
-        
-        for pattern in date_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
+        for pattern in _DATE_PATTERNS:
+            for match in pattern.finditer(content):
                 # Check if this date is near a publication indicator (skip it)
                 match_start = match.start()
                 match_end = match.end()
@@ -122,19 +143,9 @@ class URLContentAnalyzer:
                 if is_publication_date:
                     continue
                 
-                try:
-                    event_date = self._parse_date_match(match, content, month_map)
-                    if event_date:
-                        return event_date
-                except (ValueError, IndexError, TypeError) as e:
-                    # TypeError might be from missing month_map, try without it
-                    try:
-                        event_date = self._parse_date_match(match, content, month_map)
-                        if event_date:
-                            return event_date
-                    except:
-                        continue
-                    continue
+                event_date = self._parse_date_match(match, content)
+                if event_date:
+                    return event_date
         
         return None
     
@@ -143,21 +154,7 @@ class URLContentAnalyzer:
         if not text:
             return None
         
-        # Month names mapping
-        month_map = {
-            'january': 1, 'січня': 1, 'січень': 1,
-            'february': 2, 'лютого': 2, 'лютий': 2,
-            'march': 3, 'березня': 3, 'березень': 3,
-            'april': 4, 'квітня': 4, 'квітень': 4,
-            'may': 5, 'травня': 5, 'травень': 5,
-            'june': 6, 'червня': 6, 'червень': 6,
-            'july': 7, 'липня': 7, 'липень': 7,
-            'august': 8, 'серпня': 8, 'серпень': 8,
-            'september': 9, 'вересня': 9, 'вересень': 9,
-            'october': 10, 'жовтня': 10, 'жовтень': 10,
-            'november': 11, 'листопада': 11, 'листопад': 11,
-            'december': 12, 'грудня': 12, 'грудень': 12,
-        }
+        month_map = _MONTH_MAP
         
         # Pattern: "4 грудня 2025 року, об 11:00" or "4 December 2025, at 11:00"
         time_pattern = r'(\d{1,2})\s+(' + '|'.join(month_map.keys()) + r')\s+(\d{4})'
@@ -186,62 +183,30 @@ class URLContentAnalyzer:
         return None
     
     def _parse_date_match(self, match, content: str, month_map: dict = None) -> Optional[date]:
-        """Parse a date match into a date object."""
+        """Parse a date match (with day/month|month_num/year named groups) into a date object."""
         if month_map is None:
-            # Default month map if not provided
-            month_map = {
-                'january': 1, 'січня': 1, 'січень': 1,
-                'february': 2, 'лютого': 2, 'лютий': 2,
-                'march': 3, 'березня': 3, 'березень': 3,
-                'april': 4, 'квітня': 4, 'квітень': 4,
-                'may': 5, 'травня': 5, 'травень': 5,
-                'june': 6, 'червня': 6, 'червень': 6,
-                'july': 7, 'липня': 7, 'липень': 7,
-                'august': 8, 'серпня': 8, 'серпень': 8,
-                'september': 9, 'вересня': 9, 'вересень': 9,
-                'october': 10, 'жовтня': 10, 'жовтень': 10,
-                'november': 11, 'листопада': 11, 'листопад': 11,
-                'december': 12, 'грудня': 12, 'грудень': 12,
-            }
+            month_map = _MONTH_MAP
         
-        try:
-            groups = match.groups()
-            match_text = match.group(0).lower()
-            
-            # Check if it's a month name pattern
-            for month_name, month_num in month_map.items():
-                if month_name in match_text:
-                    # Pattern: "4 грудня 2025" or "December 4, 2025"
-                    if len(groups) >= 3:
-                        try:
-                            # Format: "4 грудня 2025" -> groups[0]=day, groups[1]=month_name, groups[2]=year
-                            if groups[0].isdigit() and groups[1].lower() in month_map and groups[2].isdigit():
-                                day = int(groups[0])
-                                month = month_map[groups[1].lower()]
-                                year = int(groups[2])
-                                return date(year, month, day)
-                            # Format: "December 4, 2025" -> groups[0]=month_name, groups[1]=day, groups[2]=year
-                            elif groups[0].lower() in month_map and groups[1].isdigit() and groups[2].isdigit():
-                                month = month_map[groups[0].lower()]
-                                day = int(groups[1])
-                                year = int(groups[2])
-                                return date(year, month, day)
-                        except (ValueError, IndexError, KeyError):
-                            pass
-            
-            # Pattern: YYYY-MM-DD
-            if len(groups) == 3 and groups[0].isdigit() and len(groups[0]) == 4:
-                try:
-                    year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
-                    return date(year, month, day)
-                except (ValueError, IndexError):
-                    pass
-            
-            return None
-        except Exception:
+        parts = match.groupdict()
+        day, year = parts.get('day'), parts.get('year')
+        if not day or not year:
+            return None  # e.g. "01-05 ГРУДНЯ" without a year
+        
+        if parts.get('month_num'):
+            month = int(parts['month_num'])
+        else:
+            month = month_map.get((parts.get('month') or '').lower())
+            if not month:
+                return None
+        
+        day, year = int(day), int(year)
+        if not (1 <= month <= 12 and 1 <= day <= 31):
             return None
         
-        return None
+        try:
+            return date(year, month, day)
+        except ValueError:
+            return None  # e.g. 31 November
     
     def find_event_url_in_content(self, content: str, event_title: str, base_url: str) -> Optional[str]:
         """Find the best matching event URL in content based on title."""
@@ -249,54 +214,47 @@ class URLContentAnalyzer:
             return None
         
         # Extract URLs from href attributes (most reliable)
-        href_pattern = r'<a[^>]+href=["\']([^"\']+)["\'][^>]*>([^<]*)</a>'
-        href_matches = re.findall(href_pattern, content, re.IGNORECASE | re.DOTALL)
+        try:
+            doc = lxml_html.fromstring(content)
+            doc.make_links_absolute(base_url, resolve_base_href=True)
+            href_matches = [(el.get('href'), el.text_content()) for el in doc.iter('a') if el.get('href')]
+        except Exception:
+            href_matches = _HREF_RE.findall(content)
         
         # Also extract plain URLs from text
         url_pattern = r'https?://[^\s<>"\'\)]+'
         text_urls = re.findall(url_pattern, content, re.IGNORECASE)
         
-        # Combine and clean URLs
-        clean_urls = []
-        title_lower = event_title.lower()
         title_words = [w.lower() for w in event_title.split() if len(w) > 4]
         
-        # Process href URLs (with link text for better matching)
-        for href_url, link_text in href_matches:
-            if not href_url:
-                continue
-            if not href_url.startswith(('http://', 'https://')):
-                href_url = urljoin(base_url, href_url)
-            if href_url.startswith(('http://', 'https://')):
-                clean_urls.append((href_url, link_text))
-        
-        # Process text URLs
-        for text_url in text_urls:
-            text_url = text_url.rstrip('.,;:!?)')
-            if text_url.startswith(('http://', 'https://')):
-                clean_urls.append((text_url, ''))
-        
-        # Remove duplicates
+        # Single pass: normalize, dedupe and drop non-event URLs before any scoring
         seen = set()
-        unique_urls = []
-        for url, text in clean_urls:
-            if url not in seen:
-                seen.add(url)
-                unique_urls.append((url, text))
-        
-        # Score URLs based on title match
-        scored_urls = []
+        candidates = []
+        raw_urls = [(href_url, link_text) for href_url, link_text in href_matches if href_url]
+        raw_urls.extend((text_url.rstrip('.,;:!?)'), '') for text_url in text_urls)
         
-        for url, link_text in unique_urls:
-            url_lower = url.lower()
-            link_text_lower = link_text.lower()
-            score = 0
+        for url, link_text in raw_urls:
+            if not url.startswith(('http://', 'https://')):
+                url = _cached_urljoin(base_url, url)
+                if not url.startswith(('http://', 'https://')):
+                    continue
+            if url in seen:
+                continue
+            seen.add(url)
             
             # Skip non-event URLs
+            url_lower = url.lower()
             if any(skip in url_lower for skip in ['/contact', '/about', '/home$', '/news/', '/article/', 'mailto:', 'tel:', '#']):
                 if 'eventdetail' not in url_lower and '/event/' not in url_lower:
                     continue
             
+            candidates.append((url, url_lower, link_text.lower()))
+        
+        # Cheap score first (URL patterns + title words in URL/link text)
+        cheap_scored = []
+        for url, url_lower, link_text_lower in candidates:
+            score = 0
+            
             # Very high score for eventdetail (e.g., eventdetail/3264530)
             if 'eventdetail' in url_lower:
                 score += 30
@@ -314,17 +272,25 @@ class URLContentAnalyzer:
                 text_matches = sum(1 for word in title_words if word in link_text_lower)
                 score += text_matches * 10  # Link text is very reliable
             
+            # Boost for event keywords in URL
+            if any(kw in url_lower for kw in ['conference', 'workshop', 'seminar', 'webinar', 'forum']):
+                score += 5
+            
+            cheap_scored.append((score, url, url_lower))
+        
+        # Only the top candidates get the expensive context scan
+        cheap_scored.sort(reverse=True, key=lambda x: x[0])
+        content_lower = content.lower()
+        scored_urls = []
+        
+        for score, url, url_lower in cheap_scored[:self.MAX_CONTEXT_CANDIDATES]:
             # Check context around URL in content
-            url_pos = content.lower().find(url_lower)
+            url_pos = content_lower.find(url_lower)
             if url_pos != -1:
-                context = content[max(0, url_pos-300):min(len(content), url_pos+len(url)+300)].lower()
+                context = content_lower[max(0, url_pos-300):min(len(content), url_pos+len(url)+300)]
                 context_matches = sum(1 for word in title_words if word in context)
                 score += context_matches * 2
             
-            # Boost for event keywords in URL
-            if any(kw in url_lower for kw in ['conference', 'workshop', 'seminar', 'webinar', 'forum']):
-                score += 5
-            
             if score > 0:
                 scored_urls.append((score, url))
         
@@ -1,19 +1,50 @@
 """Extract URLs from content, especially event registration links."""
 import re
+import re2
+import functools
 from typing import List, Set
 from urllib.parse import urljoin, urlparse
+from lxml import html as lxml_html
+
+# The same relative links recur across pages from one site; resolve each once
+_cached_urljoin = functools.lru_cache(maxsize=8192)(urljoin)
+
+# Whole-document scans use RE2 (linear-time DFA, no backtracking).
+# RE2's \s is ASCII-only, so \p{Z} is added to also stop at Unicode spaces (e.g. NBSP).
+# URL pattern: http:// or https:// followed by valid URL characters
+_URL_RE = re2.compile(r'(?i)https?://[^\s\p{Z}<>"\'\)]+|www\.[^\s\p{Z}<>"\'\)]+')
+# href attributes of <a> tags (fallback when lxml can't parse the page)
+_HREF_RE = re2.compile(r'(?i)<a[^>]+href=["\']([^"\']+)["\']')
+
+_HTTP_PREFIXES = ('http://', 'https://')
+_ABSOLUTE_PREFIXES = _HTTP_PREFIXES + ('mailto:', 'tel:')
+_TRAILING_PUNCT = '.,;:!?)'
+
+# Keyword lists below are ordered by how often they hit on real pages (most frequent first)
+
+# Non-event URL markers (matched literally)
+_SKIP_RE = re.compile('|'.join(re.escape(p) for p in [
+    '#', '/news/', '/about', '/contact', '/article/', 'mailto:', 'tel:', '/home$'
+]))
+# Event-related words near a URL
+_EVENT_CONTEXT_RE = re.compile('|'.join([
+    'event', 'register', 'conference', 'forum', 'registration',
+    'webinar', 'workshop', 'meeting', 'seminar', 'summit',
+    'join', 'attend', 'ticket'
+]), re.IGNORECASE)
 
 
 class URLExtractor:
     """Extracts URLs from text content, especially event-related URLs."""
     
     def __init__(self):
-        # Patterns for event-related URLs
+        # Patterns for event-related URLs, most frequent first so matching stops early
         self.event_keywords = [
-            r'event', r'conference', r'workshop', r'seminar', r'webinar',
-            r'forum', r'meeting', r'register', r'registration', r'ticket',
-            r'signup', r'rsvp', r'attend', r'join'
+            r'event', r'register', r'conference', r'forum', r'registration',
+            r'webinar', r'workshop', r'seminar', r'meeting', r'ticket',
+            r'join', r'attend', r'signup', r'rsvp'
         ]
+        self._event_keyword_re = re.compile('|'.join(self.event_keywords))
     
     def extract_urls_from_text(self, text: str, base_url: str = None) -> List[str]:
         """
@@ -29,76 +60,72 @@ class URLExtractor:
         if not text:
             return []
         
-        # URL pattern: http:// or https:// followed by valid URL characters
-        url_pattern = r'https?://[^\s<>"\'\)]+|www\.[^\s<>"\'\)]+'
-        urls = re.findall(url_pattern, text, re.IGNORECASE)
-        
-        # Clean and normalize URLs
-        cleaned_urls = []
-        for url in urls:
-            # Remove trailing punctuation
-            url = url.rstrip('.,;:!?)')
-            # Add https:// if starts with www.
-            if url.startswith('www.'):
-                url = 'https://' + url
-            # Resolve relative URLs
-            if base_url and not url.startswith(('http://', 'https://')):
-                url = urljoin(base_url, url)
-            cleaned_urls.append(url)
+        cleaned_urls = [self._clean_url(url) for url in _URL_RE.findall(text)]
         
-        return list(set(cleaned_urls))  # Remove duplicates
+        return list(dict.fromkeys(cleaned_urls))  # Remove duplicates, keep order
+    
+    def _clean_url(self, url: str) -> str:
+        """Normalize a URL matched by _URL_RE."""
+        # Remove trailing punctuation
+        url = url.rstrip(_TRAILING_PUNCT)
+        # _URL_RE only matches http(s):// or www. (any case), so only www. needs a scheme;
+        # nothing it returns is relative
+        if url[:4].lower() == 'www.':
+            url = 'https://' + url
+        return url
     
-    def extract_event_urls(self, text: str, base_url: str = None) -> List[str]:
+    def extract_event_urls(self, text: str, base_url: str = None, urls: List[str] = None) -> List[str]:
         """
         Extract URLs that are likely event-related (registration, event pages).
         
         Args:
             text: Text content to extract URLs from
             base_url: Base URL for resolving relative URLs
+            urls: URLs already extracted from text; skips scanning it again
             
         Returns:
             List of event-related URLs
         """
-        all_urls = self.extract_urls_from_text(text, base_url)
+        if not text:
+            return []
         
         event_urls = []
-        text_lower = text.lower()
         
-        for url in all_urls:
-            url_lower = url.lower()
-            
-            # Skip non-event URLs
-            skip_patterns = ['/contact', '/about', '/home$', '/news/', '/article/', 'mailto:', 'tel:', '#']
-            if any(pattern in url_lower for pattern in skip_patterns):
-                # But allow if it's clearly an event URL (e.g., eventdetail/123)
-                if 'eventdetail' not in url_lower and '/event/' not in url_lower:
-                    continue
-            
-            # Check if URL contains event-related keywords
-            if any(keyword in url_lower for keyword in self.event_keywords):
-                event_urls.append(url)
-            # Check if URL has eventdetail pattern (high priority)
-            elif 'eventdetail' in url_lower:
-                event_urls.append(url)
-            # Check if URL appears near event-related text
-            else:
-                url_pos = text_lower.find(url_lower)
-                if url_pos != -1:
-                    # Check context around URL (100 chars before and after for better matching)
-                    context_start = max(0, url_pos - 100)
-                    context_end = min(len(text_lower), url_pos + len(url) + 100)
-                    context = text_lower[context_start:context_end]
-                    
-                    # Check for event-related words near URL
-                    event_context_words = [
-                        'register', 'registration', 'ticket', 'attend', 'join',
-                        'conference', 'workshop', 'event', 'meeting', 'forum',
-                        'webinar', 'seminar', 'summit'
-                    ]
-                    if any(word in context for word in event_context_words):
-                        event_urls.append(url)
-        
-        return list(set(event_urls))  # Remove duplicates
+        if urls is None:
+            # One pass over the text: match positions give the context window directly
+            for match in _URL_RE.finditer(text):
+                url = self._clean_url(match.group(0))
+                if self._is_event_url(url, text, match.start(), match.end()):
+                    event_urls.append(url)
+        else:
+            for url in urls:
+                url_pos = text.find(url)
+                if self._is_event_url(url, text, url_pos, url_pos + len(url)):
+                    event_urls.append(url)
+        
+        return list(dict.fromkeys(event_urls))  # Remove duplicates, keep order
+    
+    def _is_event_url(self, url: str, text: str, start: int, end: int) -> bool:
+        """Classify a URL found at text[start:end] (start == -1 if its position is unknown)."""
+        url_lower = url.lower()
+        
+        # Skip non-event URLs
+        if _SKIP_RE.search(url_lower):
+            # But allow if it's clearly an event URL (e.g., eventdetail/123)
+            if 'eventdetail' not in url_lower and '/event/' not in url_lower:
+                return False
+        
+        # Check if URL contains event-related keywords
+        if self._event_keyword_re.search(url_lower):
+            return True
+        # Check if URL has eventdetail pattern (high priority)
+        if 'eventdetail' in url_lower:
+            return True
+        # Check if URL appears near event-related text (100 chars before and after)
+        if start == -1:
+            return False
+        context = text[max(0, start - 100):end + 100]
+        return _EVENT_CONTEXT_RE.search(context) is not None
     
     def extract_urls_from_html(self, html_content: str, base_url: str = None) -> List[str]:
         """
@@ -115,12 +142,15 @@ class URLExtractor:
         if not html_content:
             return []
         
-        urls = []
-        eventdetail_urls = []
+        urls, urls_seen = [], set()
+        eventdetail_urls, eventdetail_seen = [], set()
         
         # Extract href attributes from <a> tags
-        href_pattern = r'<a[^>]+href=["\']([^"\']+)["\']'
-        href_urls = re.findall(href_pattern, html_content, re.IGNORECASE)
+        try:
+            doc = lxml_html.fromstring(html_content)
+            href_urls = [a.get('href') for a in doc.iter('a') if a.get('href')]
+        except Exception:
+            href_urls = _HREF_RE.findall(html_content)
         
         for url in href_urls:
             # Clean URL
@@ -128,24 +158,27 @@ class URLExtractor:
             if not url or url.startswith('#'):
                 continue
             # Resolve relative URLs
-            if base_url and not url.startswith(('http://', 'https://', 'mailto:', 'tel:')):
-                url = urljoin(base_url, url)
-            if url.startswith(('http://', 'https://')):
+            if base_url and not url.startswith(_ABSOLUTE_PREFIXES):
+                url = _cached_urljoin(base_url, url)
+            if url.startswith(_HTTP_PREFIXES):
                 # Prioritize eventdetail URLs
                 if 'eventdetail' in url.lower():
-                    if url not in eventdetail_urls:
+                    if url not in eventdetail_seen:
+                        eventdetail_seen.add(url)
                         eventdetail_urls.append(url)
-                else:
-                    if url not in urls:
-                        urls.append(url)
+                elif url not in urls_seen:
+                    urls_seen.add(url)
+                    urls.append(url)
         
         # Also extract plain URLs from text
         text_urls = self.extract_urls_from_text(html_content, base_url)
         for url in text_urls:
             if 'eventdetail' in url.lower():
-                if url not in eventdetail_urls:
+                if url not in eventdetail_seen:
+                    eventdetail_seen.add(url)
                     eventdetail_urls.append(url)
-            elif url not in urls:
+            elif url not in urls_seen:
+                urls_seen.add(url)
                 urls.append(url)
         
         # Return eventdetail URLs first, then others
@@ -164,16 +197,14 @@ class URLExtractor:
         Returns:
             Best event URL found, or listing_url if none found
         """
-        # Extract all URLs
+        # Extract all URLs (extract_urls_from_html also picks up plain-text URLs)
         all_urls = self.extract_urls_from_html(content, listing_url)
-        if not all_urls:
-            all_urls = self.extract_urls_from_text(content, listing_url)
         
         if not all_urls:
             return listing_url
         
         # Prioritize event-related URLs
-        event_urls = self.extract_event_urls(content, listing_url)
+        event_urls = self.extract_event_urls(content, listing_url, urls=all_urls)
         
         if event_urls:
             # If we have event title, try to match URLs that contain title keywords
@@ -1,46 +1,145 @@
 """Follow URLs from aggregator/listing pages to find direct event pages."""
+import asyncio
 import requests
-from typing import Optional, List, Dict
+import httpx
+from typing import Optional, List, Dict, Tuple, Any
 from urllib.parse import urljoin, urlparse
 import re
 import time
+import bisect
+import functools
+import hashlib
+import threading
+from selectolax.lexbor import LexborHTMLParser
+from .keywords import keyword_matcher
+
+USER_AGENT = 'Mozilla/5.0 (compatible; EventIntelligenceBot/1.0)'
+
+# Memoized urljoin; listing pages repeat the same relative links
+_cached_urljoin = functools.lru_cache(maxsize=8192)(urljoin)
+
+# Links with their anchor text (fallback when the HTML parser fails)
+_HREF_TEXT_RE = re.compile(r'<a[^>]+href=["\']([^"\']+)["\'][^>]*>([^<]*)</a>', re.IGNORECASE | re.DOTALL)
+# href attributes pointing at event-like URLs (used to detect listing pages)
+_EVENT_LINK_COUNT_RE = re.compile(r'href=["\']([^"\']*event[^"\']*)["\']', re.IGNORECASE)
+# 4+ digit number suggests an event ID (like eventdetail/3264530)
+_DIGITS_RE = re.compile(r'\d{4,}')
+
+# Aggregator indicators in a page URL: /events, /event, /events/, /event- ... or /home at the end,
+# or /calendar, /upcoming, eventdetail anywhere. Suffixes are a str.endswith tuple lookup.
+_AGG_URL_SUFFIXES = tuple(
+    f'/{stem}{tail}' for stem in ('event', 'events') for tail in ('', '/', '-')
+) + ('/home',)
+_AGG_URL_SUBSTRINGS = ('eventdetail', '/calendar', '/upcoming')
+
+# Aggregator indicators at the end of a candidate link
+_LINK_AGG_SUFFIXES = ('/event', '/events', '/home', '/calendar', '/upcoming')
+
+
+# Keyword sets for link classification, ordered most frequent first
+_SKIP_KW_RE = keyword_matcher(['#', '/news/', '/about', '/contact', '/article/', 'mailto:', 'tel:', '/home$'])
+_EVENT_TYPE_KW_RE = keyword_matcher(['conference', 'forum', 'webinar', 'workshop', 'seminar'])
+_EVENT_TEXT_KW_RE = keyword_matcher(['event', 'conference', 'forum', 'webinar', 'workshop', 'meeting', 'seminar'])
+_GENERIC_PAGE_KW_RE = keyword_matcher(['/about', '/contact', '/home', '/events?', '/calendar', '/event-list'])
+
+
+def _batch_word_counts(words: List[str], texts: List[str]) -> List[int]:
+    """For each text, the number of words that occur in it.
+
+    All texts are joined into one buffer so each word costs a single C-level
+    scan instead of one ``in`` test per text.
+    """
+    counts = [0] * len(texts)
+    if not words or not texts:
+        return counts
+    buffer = '\x00'.join(texts)
+    starts = []
+    pos = 0
+    for text in texts:
+        starts.append(pos)
+        pos += len(text) + 1
+    for word in words:
+        hit = buffer.find(word)
+        while hit != -1:
+            idx = bisect.bisect_right(starts, hit) - 1
+            end = starts[idx] + len(texts[idx])
+            if hit + len(word) <= end:
+                counts[idx] += 1
+                hit = buffer.find(word, end + 1)
+            else:
+                # Match spans the separator; keep looking inside the next text
+                hit = buffer.find(word, hit + 1)
+    return counts
+
+
+def _link_bonus(link_lower: str, has_event_type: bool, is_eventdetail: bool, is_event_path: bool) -> int:
+    """Boosts for event keywords, eventdetail / event paths and numeric event IDs."""
+    # Numeric ID (like eventdetail/3264530)
+    last_segment = link_lower.rpartition('/')[2]
+    has_id = (len(last_segment) >= 4 and last_segment.isdigit()) or _DIGITS_RE.search(link_lower) is not None
+    return (3 * has_event_type
+            + 10 * is_eventdetail  # eventdetail is a strong indicator
+            + 5 * (is_event_path and not is_eventdetail)
+            + 3 * has_id)
 
 
 class URLFollower:
     """Follows URLs from aggregator pages to find direct event pages."""
     
-    def __init__(self, timeout: int = 5):
+    def __init__(self, timeout: int = 5, cache_ttl: int = 3600, cache_size: int = 10000):
         self.timeout = timeout
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; EventIntelligenceBot/1.0)'
+            'User-Agent': USER_AGENT
         })
+        
+        # Memo of page-follow results: key -> (stored_at, result)
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._cache: Dict[tuple, Tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()  # The follower is shared across worker threads
+        
+        # Per-thread event loop and HTTP client for the sync wrappers, so
+        # connections stay pooled across calls instead of per asyncio.run.
+        # Keyed by thread id so close() can shut down every thread's pool.
+        self._pools: Dict[int, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+        self._pools_lock = threading.Lock()
+    
+    def _cache_get(self, key: tuple) -> Tuple[bool, Any]:
+        """Return (hit, value) for a memoized result that hasn't expired."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        if entry and time.monotonic() - entry[0] < self.cache_ttl:
+            return True, entry[1]
+        return False, None
+    
+    def _cache_put(self, key: tuple, value: Any) -> None:
+        """Memoize a result, evicting the oldest entry when full."""
+        with self._cache_lock:
+            self._cache.pop(key, None)
+            if len(self._cache) >= self.cache_size:
+                self._cache.pop(next(iter(self._cache)), None)
+            self._cache[key] = (time.monotonic(), value)
     
     def is_aggregator_page(self, url: str, content: str) -> bool:
         """Check if URL is an aggregator/listing page."""
         url_lower = url.lower()
-        content_lower = content.lower() if content else ""
-        
-        # Aggregator indicators
-        aggregator_patterns = [
-            r'/events?[/-]?$',  # /events, /event, /events/
-            r'/home$',  # /home
-            r'/calendar',  # /calendar
-            r'/upcoming',  # /upcoming
-            r'eventdetail',  # eventdetail in URL
-        ]
         
         # Check URL
-        for pattern in aggregator_patterns:
-            if re.search(pattern, url_lower):
+        if url_lower.endswith(_AGG_URL_SUFFIXES):
+            return True
+        for indicator in _AGG_URL_SUBSTRINGS:
+            if indicator in url_lower:
                 return True
         
         # Check content for multiple events
         if content:
             # Look for multiple event links or event listings
-            event_link_count = len(re.findall(r'href=["\']([^"\']*event[^"\']*)["\']', content_lower))
-            if event_link_count > 3:  # Multiple event links suggests aggregator
-                return True
+            event_link_count = 0
+            for _ in _EVENT_LINK_COUNT_RE.finditer(content):
+                event_link_count += 1
+                if event_link_count > 3:  # Multiple event links suggests aggregator
+                    return True
         
         return False
     
@@ -55,94 +154,163 @@ class URLFollower:
         Returns:
             List of direct event URLs found, sorted by relevance
         """
+        return self._run_pooled(lambda client: self.extract_event_links_from_page_async(url, event_title, client))
+    
+    async def extract_event_links_from_page_async(self, url: str, event_title: str = None,
+                                                  client: httpx.AsyncClient = None) -> List[str]:
+        """Async version of extract_event_links_from_page (optionally on a shared client)."""
+        key = ('links', url, event_title)
+        hit, links = self._cache_get(key)
+        if hit:
+            return list(links)
+        
+        if client is None:
+            async with self._async_client() as client:
+                return await self.extract_event_links_from_page_async(url, event_title, client)
+        
+        links = await self._fetch_event_links(client, url, event_title)
+        return links if links is not None else []
+    
+    async def _fetch_event_links(self, client: httpx.AsyncClient, url: str,
+                                 event_title: str = None) -> Optional[List[str]]:
+        """Fetch and score a page's event links; None when the fetch itself failed."""
+        key = ('links', url, event_title)
+        hit, links = self._cache_get(key)
+        if hit:
+            return list(links)
+        
         try:
-            response = self.session.get(url, timeout=self.timeout, allow_redirects=True)
+            response = await client.get(url)
             if response.status_code != 200:
-                return []
-            
-            content = response.text
-            content_lower = content.lower()
+                return None  # Fetch failed, don't memoize
+            links = self._score_event_links(url, response.text, event_title)
+        except Exception as e:
+            print(f"  Error following URL {url}: {str(e)}")
+            return None
+        
+        self._cache_put(key, tuple(links))
+        return links
+    
+    def _score_event_links(self, url: str, content: str, event_title: str = None) -> List[str]:
+        """Extract event links from fetched page content, sorted by relevance."""
+        content_lower = None  # Lowercased lazily, only if title context scoring needs it
+        
+        # Extract all links with their context
+        try:
+            # lexbor keeps parsing and selection in C, which matters on MB-scale listing pages
+            tree = LexborHTMLParser(content)
+            link_matches = [(a.attributes['href'], a.text() or '') for a in tree.css('a[href]') if a.attributes['href']]
+        except Exception:
+            link_matches = _HREF_TEXT_RE.findall(content)
+        
+        event_urls = []
+        title_words = []
+        if event_title:
+            title_words = [w.lower() for w in event_title.split() if len(w) > 4]
+        
+        candidates = []
+        
+        for link, link_text in link_matches:
+            # Resolve relative URLs
+            if not link.startswith(('http://', 'https://')):
+                link = _cached_urljoin(url, link)
             
-            # Extract all links with their context
-            href_pattern = r'<a[^>]+href=["\']([^"\']+)["\'][^>]*>([^<]*)</a>'
-            link_matches = re.findall(href_pattern, content, re.IGNORECASE | re.DOTALL)
+            link_lower = link.lower()
+            link_text_lower = link_text.lower()
             
-            event_urls = []
-            title_words = []
-            if event_title:
-                title_words = [w.lower() for w in event_title.split() if len(w) > 4]
+            # Cheap substring checks first; regexes only run when still needed
+            is_eventdetail = 'eventdetail' in link_lower
+            is_event_path = '/event/' in link_lower or '/events/' in link_lower
+            has_event_type = _EVENT_TYPE_KW_RE.search(link_lower) is not None
             
-            scored_urls = []
+            # Check if link looks like an event page (eventdetail, /event/, event-type keywords)
+            is_event_page = is_eventdetail or is_event_path or has_event_type
             
-            for link, link_text in link_matches:
-                # Resolve relative URLs
-                if not link.startswith(('http://', 'https://')):
-                    link = urljoin(url, link)
-                
-                link_lower = link.lower()
-                link_text_lower = link_text.lower()
-                
-                # Skip certain types of links (but allow if they contain event keywords or eventdetail)
-                skip_patterns = ['/contact', '/about', '/home$', '/news/', '/article/', 'mailto:', 'tel:', '#']
-                should_skip = any(skip in link_lower for skip in skip_patterns)
-                # Don't skip if it's clearly an event page (eventdetail, /event/, etc.)
-                is_clear_event = 'eventdetail' in link_lower or '/event/' in link_lower or '/events/' in link_lower
-                if should_skip and not is_clear_event and not any(kw in link_lower for kw in ['conference', 'workshop', 'seminar', 'webinar', 'forum']):
-                    continue
-                
-                # Check if link looks like an event page
-                event_indicators = ['/event/', '/events/', 'eventdetail', 'conference', 'workshop', 'seminar', 'webinar', 'forum']
-                aggregator_indicators = ['/events?$', '/home$', '/calendar$', '/upcoming$']
-                
-                is_event_page = any(ind in link_lower for ind in event_indicators)
-                is_aggregator = any(re.search(ind, link_lower) for ind in aggregator_indicators)
-                
-                # Also consider links that have event-related text even if URL doesn't
-                has_event_text = any(kw in link_text_lower for kw in ['conference', 'workshop', 'seminar', 'webinar', 'forum', 'event', 'meeting'])
-                
-                if (is_event_page or has_event_text) and not is_aggregator:
-                    score = 0
-                    
-                    # Score based on title match
-                    if title_words:
-                        # Check URL
-                        url_matches = sum(1 for word in title_words if word in link_lower)
-                        # Check link text (more important for matching)
-                        text_matches = sum(1 for word in title_words if word in link_text_lower)
-                        # Check surrounding context (50 chars around link)
-                        link_pos = content_lower.find(link_lower)
-                        if link_pos != -1:
-                            context = content_lower[max(0, link_pos-50):min(len(content_lower), link_pos+len(link)+50)]
-                            context_matches = sum(1 for word in title_words if word in context)
-                            score = url_matches * 3 + text_matches * 2 + context_matches
-                        else:
-                            score = url_matches * 3 + text_matches * 2
-                    else:
-                        score = 1  # Default score if no title
-                    
-                    # Boost score for event-related keywords in URL
-                    if any(kw in link_lower for kw in ['conference', 'workshop', 'seminar', 'webinar', 'forum']):
-                        score += 3
-                    
-                    # Boost for eventdetail, /event/, /events/ patterns (highest priority)
-                    if 'eventdetail' in link_lower:
-                        score += 10  # eventdetail is a strong indicator
-                    elif '/event/' in link_lower or '/events/' in link_lower:
-                        score += 5
-                    
-                    # Boost if URL contains numeric ID (like eventdetail/3264530)
-                    if re.search(r'\d{4,}', link_lower):  # 4+ digit number suggests event ID
-                        score += 3
-                    
-                    scored_urls.append((score, link))
+            # Skip certain types of links (but allow if they contain event keywords or eventdetail)
+            if not is_event_page and _SKIP_KW_RE.search(link_lower):
+                continue
             
-            # Sort by score (highest first) and return URLs
-            scored_urls.sort(reverse=True, key=lambda x: x[0])
-            return [url for score, url in scored_urls if score > 0]
+            # Also consider links that have event-related text even if URL doesn't
+            if not is_event_page and not _EVENT_TEXT_KW_RE.search(link_text_lower):
+                continue
             
-        except Exception as e:
-            print(f"  Error following URL {url}: {str(e)}")
-            return []
+            if not link_lower.endswith(_LINK_AGG_SUFFIXES):
+                context = ''
+                if title_words:
+                    # Surrounding context (50 chars around link)
+                    if content_lower is None:
+                        content_lower = content.lower()
+                    link_pos = content_lower.find(link_lower)
+                    if link_pos != -1:
+                        context = content_lower[max(0, link_pos-50):min(len(content_lower), link_pos+len(link)+50)]
+                
+                candidates.append((link, link_lower, link_text_lower, context,
+                                   _link_bonus(link_lower, has_event_type, is_eventdetail, is_event_path)))
+        
+        # Title-word matches, scored per field across all candidate links at once:
+        # URL matches x3, link text x2, surrounding context x1
+        if title_words:
+            url_counts = _batch_word_counts(title_words, [c[1] for c in candidates])
+            text_counts = _batch_word_counts(title_words, [c[2] for c in candidates])
+            ctx_counts = _batch_word_counts(title_words, [c[3] for c in candidates])
+            scored_urls = [
+                (url_counts[i] * 3 + text_counts[i] * 2 + ctx_counts[i] + c[4], c[0])
+                for i, c in enumerate(candidates)
+            ]
+        else:
+            scored_urls = [(1 + c[4], c[0]) for c in candidates]  # Default score if no title
+        
+        # Sort by score (highest first) and return URLs
+        scored_urls.sort(reverse=True, key=lambda x: x[0])
+        return [url for score, url in scored_urls if score > 0]
+    
+    def _async_client(self) -> httpx.AsyncClient:
+        """HTTP/2 client for concurrent page fetches."""
+        return httpx.AsyncClient(
+            http2=True,
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={'User-Agent': USER_AGENT},
+            limits=httpx.Limits(max_keepalive_connections=50)
+        )
+    
+    def _run_pooled(self, make_coro):
+        """Run make_coro(client) on this thread's long-lived loop and HTTP client."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("URLFollower sync methods cannot be called from a running event loop; "
+                               "use the *_async variants instead")
+        
+        thread_id = threading.get_ident()
+        with self._pools_lock:
+            pool = self._pools.get(thread_id)
+            if pool is None:
+                pool = self._pools[thread_id] = (asyncio.new_event_loop(), self._async_client())
+        loop, client = pool
+        return loop.run_until_complete(make_coro(client))
+    
+    def close(self) -> None:
+        """Close the pooled HTTP clients and event loops created by the sync wrappers.
+        
+        Call once no other thread is still using the follower.
+        """
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for loop, client in pools:
+            try:
+                loop.run_until_complete(client.aclose())
+            finally:
+                loop.close()
+    
+    def __enter__(self) -> 'URLFollower':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
     def find_direct_event_url(self, url: str, event_title: str = None, page_content: str = None, max_depth: int = 2) -> Optional[str]:
         """
@@ -163,49 +331,82 @@ class URLFollower:
         Returns:
             Direct event URL if found, None otherwise
         """
+        return self._run_pooled(
+            lambda client: self.find_direct_event_url_async(url, event_title, page_content, max_depth, client)
+        )
+    
+    async def find_direct_event_url_async(self, url: str, event_title: str = None, page_content: str = None,
+                                          max_depth: int = 2, client: httpx.AsyncClient = None) -> Optional[str]:
+        """Async version of find_direct_event_url; candidate links are fetched concurrently."""
+        content_key = hashlib.blake2b(page_content.encode(), digest_size=8).hexdigest() if page_content else None
+        key = ('direct', url, event_title, max_depth, content_key)
+        hit, direct_url = self._cache_get(key)
+        if hit:
+            return direct_url
+        
+        if client is None:
+            async with self._async_client() as client:
+                direct_url, fetch_failed = await self._find_direct_event_url(client, url, event_title, page_content, max_depth)
+        else:
+            direct_url, fetch_failed = await self._find_direct_event_url(client, url, event_title, page_content, max_depth)
+        if not fetch_failed:
+            self._cache_put(key, direct_url)  # A failed listing fetch is retried next time
+        return direct_url
+    
+    async def _find_direct_event_url(self, client: httpx.AsyncClient, url: str, event_title: str,
+                                     page_content: Optional[str], max_depth: int) -> Tuple[Optional[str], bool]:
+        """Uncached implementation of find_direct_event_url_async.
+        
+        Returns:
+            (direct_url, fetch_failed) where fetch_failed means the listing page could not be fetched
+        """
         # Check if URL is a generic page that should ALWAYS be followed
         url_lower = url.lower()
-        generic_pages = ['/home', '/contact', '/about', '/events?', '/event-list', '/calendar']
-        is_generic = any(page in url_lower for page in generic_pages)
+        is_generic = _GENERIC_PAGE_KW_RE.search(url_lower) is not None
         
         # If we have content, check if it's an aggregator
         if page_content:
             if not self.is_aggregator_page(url, page_content) and not is_generic:
-                return None  # Not an aggregator, return as-is
+                return None, False  # Not an aggregator, return as-is
         
         # If it's a generic page, ALWAYS try to find better URL
         if is_generic or not page_content:
             # Try to extract event links
-            event_links = self.extract_event_links_from_page(url, event_title)
+            event_links = await self._fetch_event_links(client, url, event_title)
+            if event_links is None:
+                return None, True
             
             if event_links:
                 # If we found eventdetail URLs, return the best one immediately
                 eventdetail_urls = [u for u in event_links if 'eventdetail' in u.lower()]
                 if eventdetail_urls:
-                    return eventdetail_urls[0]
+                    return eventdetail_urls[0], False
                 
                 # If max_depth > 1, try following links deeper to extract event details
                 if max_depth > 1 and event_links:
                     # For listing pages, try following multiple links to find the best match
                     # This allows us to go to second level and extract actual event details
-                    for link in event_links[:5]:  # Try top 5 links
+                    candidates = event_links[:5]  # Try top 5 links
+                    responses = await asyncio.gather(*(client.get(link) for link in candidates), return_exceptions=True)
+                    for link, response in zip(candidates, responses):
                         try:
-                            response = self.session.get(link, timeout=self.timeout, allow_redirects=True)
+                            if isinstance(response, Exception):
+                                continue  # Try next link if this one fails
                             if response.status_code == 200:
                                 content = response.text
                                 
                                 # Check if this link is still an aggregator (needs deeper following)
                                 if self.is_aggregator_page(link, content):
                                     # Follow one more level deep
-                                    deeper_links = self.extract_event_links_from_page(link, event_title)
+                                    deeper_links = self._links_from_content(link, content, event_title)
                                     if deeper_links:
                                         # Prioritize eventdetail URLs
                                         eventdetail_deeper = [u for u in deeper_links if 'eventdetail' in u.lower()]
                                         if eventdetail_deeper:
-                                            return eventdetail_deeper[0]
+                                            return eventdetail_deeper[0], False
                                         # If max_depth allows, return the best deeper link
                                         if max_depth > 2:
-                                            return deeper_links[0]
+                                            return deeper_links[0], False
                                 
                                 # If this link is already an event detail page, check if it matches the title
                                 elif 'eventdetail' in link.lower() or '/event/' in link.lower():
@@ -213,21 +414,30 @@ class URLFollower:
                                     if event_title:
                                         # Check if title appears in content
                                         title_words = [w.lower() for w in event_title.split() if len(w) > 4]
-                                        content_lower = content.lower()
-                                        matches = sum(1 for word in title_words if word in content_lower[:2000])
+                                        content_head = content[:2000].lower()
+                                        matches = sum(1 for word in title_words if word in content_head)
                                         if matches >= 1:  # At least one keyword match
-                                            return link
+                                            return link, False
                                     else:
                                         # No title to match, return this eventdetail URL
-                                        return link
+                                        return link, False
                         except Exception:
                             continue  # Try next link if this one fails
                     
                     # If we didn't find a perfect match, return the best link from first level
-                    return event_links[0]
+                    return event_links[0], False
                 
                 # Return the best match (first in list)
-                return event_links[0]
+                return event_links[0], False
         
-        return None
-
+        return None, False
+    
+    def _links_from_content(self, url: str, content: str, event_title: str = None) -> List[str]:
+        """Event links for an already-fetched page, sharing the extract_event_links_from_page memo."""
+        key = ('links', url, event_title)
+        hit, links = self._cache_get(key)
+        if hit:
+            return list(links)
+        links = self._score_event_links(url, content, event_title)
+        self._cache_put(key, tuple(links))
+        return links
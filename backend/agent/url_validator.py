@@ -1,25 +1,80 @@
 """URL validation and accessibility checking."""
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional, Tuple, Dict
 from urllib.parse import urlparse
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import socket
 import time
 
+# URLs repeat heavily across validation batches; parse each one once
+_cached_urlparse = functools.lru_cache(maxsize=8192)(urlparse)
+
+# Host resolution cache; opt-in per process via install_dns_cache()
+DNS_CACHE_TTL = 300  # seconds
+DNS_CACHE_SIZE = 2048
+_original_getaddrinfo = socket.getaddrinfo
+_dns_cache: Dict[tuple, Tuple[float, list]] = {}
+_dns_lock = threading.Lock()
+
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """socket.getaddrinfo with a TTL cache keyed on all arguments."""
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    entry = _dns_cache.get(key)
+    if entry and now - entry[0] < DNS_CACHE_TTL:
+        return list(entry[1])
+    
+    result = _original_getaddrinfo(host, port, family, type, proto, flags)
+    with _dns_lock:
+        if len(_dns_cache) >= DNS_CACHE_SIZE:
+            _dns_cache.clear()
+        _dns_cache[key] = (now, result)
+    return list(result)
+
+
+def install_dns_cache() -> None:
+    """Route socket.getaddrinfo through the TTL cache (safe to call repeatedly).
+    
+    This patches resolution for every client in the process (Supabase, OpenAI,
+    httpx, ...), so only script entry points that do bulk URL checking call it.
+    """
+    socket.getaddrinfo = _cached_getaddrinfo
+
 
 class URLValidator:
     """Validates URLs and checks if they are accessible."""
     
-    def __init__(self, timeout: int = 5, max_redirects: int = 5):
+    def __init__(self, timeout: int = 5, max_redirects: int = 5, max_workers: int = 32,
+                 per_host_interval: float = 0.1):
         """
         Initialize URL validator.
         
         Args:
-            timeout: Request timeout in seconds
+            timeout: Request (read) timeout in seconds
             max_redirects: Maximum number of redirects to follow
+            max_workers: Number of URLs checked concurrently
+            per_host_interval: Minimum delay in seconds between requests to the same host
         """
         self.timeout = timeout
+        self.connect_timeout = min(2, timeout)  # Fail fast on unreachable hosts
+        self._timeout = (self.connect_timeout, timeout)
         self.max_redirects = max_redirects
+        self.max_workers = max_workers
+        self.per_host_interval = per_host_interval
         self.session = requests.Session()
         self.session.max_redirects = max_redirects
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; EventIntelligenceBot/1.0)'
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Next free request slot per host (rate limiting across worker threads)
+        self._host_lock = threading.Lock()
+        self._host_next_slot: Dict[str, float] = {}
     
     def is_valid_url_format(self, url: str) -> bool:
         """Check if URL has valid format."""
@@ -27,7 +82,7 @@ class URLValidator:
             return False
         
         try:
-            result = urlparse(url)
+            result = _cached_urlparse(url)
             return all([result.scheme in ['http', 'https'], result.netloc])
         except Exception:
             return False
@@ -47,26 +102,18 @@ class URLValidator:
         
         try:
             # Use HEAD request first (faster, doesn't download content)
-            response = self.session.head(
-                url,
-                timeout=self.timeout,
-                allow_redirects=True,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (compatible; EventIntelligenceBot/1.0)'
-                }
-            )
+            response = self.session.head(url, timeout=self._timeout, allow_redirects=True)
             
-            # If HEAD is not allowed, try GET
+            # If HEAD is not allowed, try GET on the same pooled connection
             if response.status_code == 405:
                 response = self.session.get(
                     url,
-                    timeout=self.timeout,
+                    timeout=self._timeout,
                     allow_redirects=True,
-                    headers={
-                        'User-Agent': 'Mozilla/5.0 (compatible; EventIntelligenceBot/1.0)'
-                    },
                     stream=True  # Don't download full content
                 )
+                # Only the status is needed; release the connection without reading the body
+                response.close()
             
             # Check if status is successful (2xx or 3xx)
             if 200 <= response.status_code < 400:
@@ -97,6 +144,7 @@ class URLValidator:
             Dict mapping URL to (is_valid, error_message) tuple
         """
         results = {}
+        to_check = []
         
         for url in urls:
             if not url:
@@ -108,14 +156,27 @@ class URLValidator:
                 continue
             
             if check_accessibility:
-                is_accessible, error = self.check_url_accessibility(url)
-                results[url] = (is_accessible, error)
+                if url not in results:
+                    results[url] = (False, "Not checked")
+                    to_check.append(url)
             else:
                 results[url] = (True, None)
-            
-            # Small delay to avoid rate limiting
-            if check_accessibility:
-                time.sleep(0.1)
+        
+        if to_check:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self._check_url_throttled, url): url for url in to_check}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
         
         return results
-
+    
+    def _check_url_throttled(self, url: str) -> Tuple[bool, Optional[str]]:
+        """Check URL accessibility, spacing out requests to the same host."""
+        host = _cached_urlparse(url).netloc.lower()
+        with self._host_lock:
+            now = time.monotonic()
+            slot = max(now, self._host_next_slot.get(host, 0.0))
+            self._host_next_slot[host] = slot + self.per_host_interval
+        if slot > now:
+            time.sleep(slot - now)
+        return self.check_url_accessibility(url)
@@ -1,20 +1,129 @@
 """Analyze all events in database to determine relevance."""
 import sys
 import os
+from collections import Counter
+from enum import IntFlag
 from datetime import date, timedelta
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.models import Event
 from agent.url_validator import URLValidator
 from agent.url_content_analyzer import URLContentAnalyzer
 from agent.date_validator import DateValidator
 from agent.duplicate_detector import DuplicateDetector
+from agent.keywords import keyword_matcher
 
-def analyze_event(event: Event, all_events: List[Event], event_data: dict) -> Dict:
-    """Analyze a single event and return analysis results."""
+class Issue(IntFlag):
+    """Problems found by analyze_event, in check order."""
+    PROGRAM = 1
+    SUMMARY_PROGRAM = 2
+    NEWS = 4
+    NEWS_URL = 8
+    LOCAL = 16
+    AGGREGATOR_URL = 32
+    PAST_DATE = 64
+    PAST_CONTENT = 128
+    INVALID_URL = 256
+    DUPLICATE = 512
+
+
+# Report text per issue; formatted only when printing
+ISSUE_MESSAGES = {
+    Issue.PROGRAM: "❌ Program announcement (not an event)",
+    Issue.SUMMARY_PROGRAM: "❌ Summary indicates program announcement",
+    Issue.NEWS: "❌ Appears to be news/article",
+    Issue.NEWS_URL: "❌ URL is a news article URL",
+    Issue.LOCAL: "⚠️  Local/narrow event (may be too specific)",
+    Issue.AGGREGATOR_URL: "⚠️  URL appears to be aggregator/listing page, not direct event page",
+    Issue.PAST_DATE: "❌ Event date is in the past",
+    Issue.PAST_CONTENT: "❌ URL content indicates past event",
+    Issue.INVALID_URL: "❌ URL format is invalid",
+    Issue.DUPLICATE: "❌ Duplicate event",
+}
+
+
+def issue_messages(analysis: Dict) -> List[str]:
+    """Render an analysis' issue flags as report lines."""
+    messages = []
+    for flag in Issue:
+        if analysis["issues"] & flag:
+            message = ISSUE_MESSAGES[flag]
+            if flag is Issue.PAST_CONTENT:
+                message = f"{message}: {analysis['past_reason']}"
+            messages.append(message)
+    return messages
+
+
+# Indicator sets, compiled once at import instead of rebuilt per event
+_PROGRAM_RE = keyword_matcher([
+    "compensation program", "housing program", "program for",
+    "applications open", "can submit", "submitting applications",
+    "program starts", "access to"
+])
+_SUMMARY_EVENT_RE = keyword_matcher(["conference", "workshop", "seminar", "webinar", "forum", "event", "meeting"])
+_NEWS_RE = keyword_matcher(["news", "article", "blog", "report", "analysis"])
+_TITLE_EVENT_RE = keyword_matcher(["conference", "workshop", "seminar", "webinar", "forum", "event"])
+_NEWS_PATH_RE = keyword_matcher(["/news/", "/article/", "/blog/", "/press-release/"])
+_LOCAL_RE = keyword_matcher([
+    "засідання архітектурно", "містобудівної ради", "обласна рада", "міська рада",
+    "районна рада", "територіальна громада", "municipal council meeting",
+    "regional council meeting", "oblast", "район", "громада"
+])
+_MAJOR_EVENT_RE = keyword_matcher(["conference", "forum", "summit", "international", "національний", "міжнародний"])
+_AGGREGATOR_RE = keyword_matcher(['/contact', '/about', '/home', '/events?', '/event-list', '/calendar'])
+_EVENT_PAGE_RE = keyword_matcher(['eventdetail', '/event/', '/events/'])
+_GENERIC_PAGE_RE = keyword_matcher(['/contact', '/about', '/home'])
+_EVENT_INDICATOR_RE = keyword_matcher([
+    "conference", "workshop", "seminar", "webinar", "forum", "training",
+    "meeting", "event", "symposium", "summit"
+])
+
+
+def _duplicate_candidates(events: List[Event], tolerance_days: int) -> List[List[int]]:
+    """
+    For each event, indices of the other events it could be a duplicate of.
+    
+    DuplicateDetector.is_duplicate never matches events whose dates are further
+    apart than its tolerance, so bucketing by date drops only pairs it would reject.
+    """
+    by_date: Dict[date, List[int]] = {}
+    for i, e in enumerate(events):
+        by_date.setdefault(e.event_date, []).append(i)
+    
+    candidates = []
+    for e in events:
+        nearby = []
+        for offset in range(-tolerance_days, tolerance_days + 1):
+            for j in by_date.get(e.event_date + timedelta(days=offset), ()):
+                if events[j].url != e.url:
+                    nearby.append(j)
+        candidates.append(nearby)
+    return candidates
+
+
+def analyze_event(event: Event, index: int, event_dicts: List[dict],
+                  duplicate_candidates: List[int], event_data: dict,
+                  duplicate_detector: DuplicateDetector,
+                  past_result: Tuple[bool, Optional[str]],
+                  today: date, six_months: date) -> Dict:
+    """
+    Analyze a single event and return analysis results.
+    
+    Args:
+        event: Event to analyze
+        index: Position of the event in event_dicts
+        event_dicts: All events as dicts (event_date kept as a date object)
+        duplicate_candidates: Indices into event_dicts of possible duplicates
+        event_data: Raw database row for the event
+        duplicate_detector: Shared duplicate detector
+        past_result: Precomputed DateValidator.check_if_past_event result for the event URL
+        today: Reference date for the past-date check, fixed for the whole run
+        six_months: Cutoff for the far-future warning (today + 180 days)
+    """
     analysis = {
         "id": event_data.get("id", "N/A"),
         "title": event.event_title,
@@ -22,134 +131,103 @@ def analyze_event(event: Event, all_events: List[Event], event_data: dict) -> Di
         "url": event.url,
         "category": event.category,
         "summary": event.summary,
-        "issues": [],
+        "issues": Issue(0),
+        "past_reason": None,
         "warnings": [],
         "is_valid": True,
         "should_remove": False,
         "should_update": False
     }
     
-    # Check 1: Is it a program announcement?
     title_lower = event.event_title.lower()
     summary_lower = (event.summary or "").lower()
+    url_lower = event.url.lower()
+    # Checks 4 and 11 accept a hit in either field; no indicator contains a newline,
+    # so one scan over both can't match across the join
+    title_and_summary = f"{title_lower}\n{summary_lower}"
     
-    program_indicators = [
-        "compensation program", "housing program", "program for",
-        "applications open", "can submit", "submitting applications",
-        "program starts", "access to"
-    ]
-    
-    if any(indicator in title_lower for indicator in program_indicators):
-        analysis["issues"].append("❌ Program announcement (not an event)")
+    # Check 1: Is it a program announcement?
+    if _PROGRAM_RE.search(title_lower):
+        analysis["issues"] |= Issue.PROGRAM
         analysis["is_valid"] = False
         analysis["should_remove"] = True
     
-    if any(indicator in summary_lower for indicator in program_indicators):
-        if not any(kw in summary_lower for kw in ["conference", "workshop", "seminar", "webinar", "forum", "event", "meeting"]):
-            analysis["issues"].append("❌ Summary indicates program announcement")
+    if _PROGRAM_RE.search(summary_lower):
+        if not _SUMMARY_EVENT_RE.search(summary_lower):
+            analysis["issues"] |= Issue.SUMMARY_PROGRAM
             analysis["is_valid"] = False
             analysis["should_remove"] = True
     
     # Check 2: Is it news?
-    news_indicators = ["news", "article", "blog", "report", "analysis"]
-    if any(indicator in title_lower for indicator in news_indicators):
-        if not any(kw in title_lower for kw in ["conference", "workshop", "seminar", "webinar", "forum", "event"]):
-            analysis["issues"].append("❌ Appears to be news/article")
+    if _NEWS_RE.search(title_lower):
+        if not _TITLE_EVENT_RE.search(title_lower):
+            analysis["issues"] |= Issue.NEWS
             analysis["is_valid"] = False
             analysis["should_remove"] = True
     
     # Check 3: Is URL a news article URL? (check URL path)
-    url_lower = event.url.lower()
-    news_path_indicators = ["/news/", "/article/", "/blog/", "/press-release/"]
-    if any(indicator in url_lower for indicator in news_path_indicators):
-        analysis["issues"].append("❌ URL is a news article URL")
+    if _NEWS_PATH_RE.search(url_lower):
+        analysis["issues"] |= Issue.NEWS_URL
         analysis["is_valid"] = False
         analysis["should_remove"] = True
     
     # Check 4: Is it a local/narrow event? (check title/summary for local indicators)
-    local_indicators = [
-        "засідання архітектурно", "містобудівної ради", "обласна рада", "міська рада",
-        "районна рада", "територіальна громада", "municipal council meeting",
-        "regional council meeting", "oblast", "район", "громада"
-    ]
-    title_lower = event.event_title.lower()
-    summary_lower = (event.summary or "").lower()
-    if any(indicator in title_lower for indicator in local_indicators) or \
-       any(indicator in summary_lower for indicator in local_indicators):
+    if _LOCAL_RE.search(title_and_summary):
         # Check if it's NOT a major event
-        event_keywords = ["conference", "forum", "summit", "international", "національний", "міжнародний"]
-        if not any(kw in title_lower for kw in event_keywords) and \
-           not any(kw in summary_lower for kw in event_keywords):
-            analysis["issues"].append("⚠️  Local/narrow event (may be too specific)")
+        if not _MAJOR_EVENT_RE.search(title_and_summary):
+            analysis["issues"] |= Issue.LOCAL
             analysis["warnings"].append("Consider if this is relevant for the target audience")
     
     # Check 5: Is URL an aggregator/listing page?
-    url_lower = event.url.lower()
-    aggregator_indicators = ['/contact', '/about', '/home', '/events?', '/event-list', '/calendar']
-    event_page_indicators = ['eventdetail', '/event/', '/events/']
-    
-    is_aggregator = any(ind in url_lower for ind in aggregator_indicators)
-    is_event_page = any(ind in url_lower for ind in event_page_indicators)
+    is_aggregator = _AGGREGATOR_RE.search(url_lower) is not None
+    is_event_page = _EVENT_PAGE_RE.search(url_lower) is not None
     
     if is_aggregator and not is_event_page:
-        analysis["issues"].append("⚠️  URL appears to be aggregator/listing page, not direct event page")
+        analysis["issues"] |= Issue.AGGREGATOR_URL
         analysis["should_update"] = True
         analysis["warnings"].append("Should find direct event URL")
     
     # Check 6: Is date in the past?
-    today = date.today()
     if event.event_date < today:
-        analysis["issues"].append("❌ Event date is in the past")
+        analysis["issues"] |= Issue.PAST_DATE
         analysis["is_valid"] = False
         analysis["should_remove"] = True
     
     # Check 7: Is date too far in the future (>6 months)?
-    six_months = today + timedelta(days=180)
     if event.event_date > six_months:
         analysis["warnings"].append("⚠️  Event date is more than 6 months away")
     
     # Check 8: Check if URL content indicates past event
-    date_validator = DateValidator()
-    is_past, reason = date_validator.check_if_past_event(event.url, event.event_date)
+    is_past, reason = past_result
     if is_past:
-        analysis["issues"].append(f"❌ URL content indicates past event: {reason}")
+        analysis["issues"] |= Issue.PAST_CONTENT
+        analysis["past_reason"] = reason
         analysis["is_valid"] = False
         analysis["should_remove"] = True
     
     # Check 9: Is URL accessible? (skip for now to avoid network calls, just check format)
-    url_lower = event.url.lower()
     if not event.url.startswith(('http://', 'https://')):
-        analysis["issues"].append("❌ URL format is invalid")
+        analysis["issues"] |= Issue.INVALID_URL
         analysis["is_valid"] = False
         analysis["should_remove"] = True
-    elif any(skip in url_lower for skip in ['/contact', '/about', '/home']):
+    elif _GENERIC_PAGE_RE.search(url_lower):
         # Check if it's just a generic page (not an event page)
         if 'eventdetail' not in url_lower and '/event/' not in url_lower:
             analysis["warnings"].append("⚠️  URL appears to be a generic page (contact/about/home)")
     
     # Check 10: Is it a duplicate?
-    duplicate_detector = DuplicateDetector()
-    event_dict = event.to_dict()
-    event_dict["event_date"] = event.event_date  # Ensure date is date object, not string
-    other_events_data = []
-    for e in all_events:
-        if e.url != event.url:
-            e_dict = e.to_dict()
-            e_dict["event_date"] = e.event_date
-            other_events_data.append(e_dict)
-    
-    # Check against each other event
-    for other_event_dict in other_events_data:
-        if duplicate_detector.is_duplicate(event_dict, other_event_dict):
-            analysis["issues"].append("❌ Duplicate event")
+    event_dict = event_dicts[index]
+    
+    # Check against each other event that could match on date
+    for other_index in duplicate_candidates:
+        if duplicate_detector.is_duplicate(event_dict, event_dicts[other_index]):
+            analysis["issues"] |= Issue.DUPLICATE
             analysis["is_valid"] = False
             analysis["should_remove"] = True
             break
     
     # Check 11: Does it have required event indicators?
-    event_indicators = ["conference", "workshop", "seminar", "webinar", "forum", "training", "meeting", "event", "symposium", "summit"]
-    has_event_indicator = any(indicator in title_lower for indicator in event_indicators) or \
-                         any(indicator in summary_lower for indicator in event_indicators)
+    has_event_indicator = _EVENT_INDICATOR_RE.search(title_and_summary) is not None
     
     if not has_event_indicator and analysis["is_valid"]:
         analysis["warnings"].append("⚠️  No clear event indicator in title/summary")
@@ -163,23 +241,46 @@ def main():
     print("=" * 80)
     print()
     
-    db_client = DatabaseClient()
+    db_client = get_db()
     
     # Fetch all events
     print("Fetching all events from database...")
     # Get all events (including past ones for analysis)
-    events_data = db_client.get_all_events(limit=2000)
+    # Paged, so the table isn't capped at PostgREST's max rows per request
+    events_data = list(db_client.iter_all_events(limit=2000))
     events = [Event(**e) for e in events_data]
     print(f"Found {len(events)} events\n")
     
+    date_validator = DateValidator()
+    duplicate_detector = DuplicateDetector()
+    
+    # URL content checks are network-bound; fetch them all concurrently up front
+    print("Checking event URLs for past-event indicators...")
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        past_results = list(executor.map(
+            lambda e: date_validator.check_if_past_event(e.url, e.event_date), events
+        ))
+    
+    # Convert once; the duplicate check only compares events that share a date
+    event_dicts = []
+    for e in events:
+        e_dict = e.to_dict()
+        e_dict["event_date"] = e.event_date  # Ensure date is date object, not string
+        event_dicts.append(e_dict)
+    candidates = _duplicate_candidates(events, duplicate_detector.date_tolerance_days)
+    
+    today = date.today()
+    six_months = today + timedelta(days=180)
+    
     # Analyze each event
     analyses = []
-    for event_data, event in zip(events_data, events):
-        analysis = analyze_event(event, events, event_data)
+    for i, (event_data, event, past_result) in enumerate(zip(events_data, events, past_results)):
+        analysis = analyze_event(event, i, event_dicts, candidates[i], event_data,
+                                 duplicate_detector, past_result, today, six_months)
         analyses.append(analysis)
     
     # Sort by validity (invalid first)
-    analyses.sort(key=lambda x: (x["is_valid"], len(x["issues"])))
+    analyses.sort(key=lambda x: (x["is_valid"], x["issues"].bit_count()))
     
     # Print results
     valid_count = sum(1 for a in analyses if a["is_valid"])
@@ -207,7 +308,7 @@ def main():
                 if analysis['summary']:
                     print(f"   Summary: {analysis['summary'][:100]}...")
                 print(f"   Issues:")
-                for issue in analysis['issues']:
+                for issue in issue_messages(analysis):
                     print(f"     {issue}")
         print()
     
@@ -247,14 +348,12 @@ def main():
     print("=" * 80)
     print("ISSUE BREAKDOWN")
     print("=" * 80)
-    issue_counts = {}
+    issue_counts = Counter()
     for analysis in analyses:
-        for issue in analysis['issues']:
-            issue_type = issue.split(':')[0] if ':' in issue else issue
-            issue_counts[issue_type] = issue_counts.get(issue_type, 0) + 1
+        issue_counts.update(flag for flag in Issue if analysis['issues'] & flag)
     
-    for issue_type, count in sorted(issue_counts.items(), key=lambda x: x[1], reverse=True):
-        print(f"{issue_type}: {count}")
+    for flag, count in issue_counts.most_common():
+        print(f"{ISSUE_MESSAGES[flag]}: {count}")
     print()
     
     # Recommendations
@@ -35,30 +35,23 @@ def setup_database():
             schema_path = os.path.join(base_dir, "database", "schema.sql")
             rls_path = os.path.join(base_dir, "database", "rls_policy.sql")
             
+            # Each file goes over in a single execute (one round-trip). This also keeps
+            # the plpgsql function body intact, which splitting on ';' would break.
+            # Both files guard their trigger/policy (DROP ... IF EXISTS, pg_policies
+            # check), so re-running them on a set-up database succeeds as a whole.
             print("   📊 Creating events table and indexes...")
             with open(schema_path, 'r') as f:
-                sql = f.read()
-                # Execute each statement separately
-                for statement in sql.split(';'):
-                    statement = statement.strip()
-                    if statement and not statement.startswith('--'):
-                        try:
-                            cur.execute(statement)
-                        except Exception as e:
-                            if "already exists" not in str(e).lower():
-                                print(f"      ⚠️  {str(e)[:100]}")
+                try:
+                    cur.execute(f.read())
+                except Exception as e:
+                    print(f"      ⚠️  {str(e)[:100]}")
             
             print("   🔒 Setting up RLS policies...")
             with open(rls_path, 'r') as f:
-                sql = f.read()
-                for statement in sql.split(';'):
-                    statement = statement.strip()
-                    if statement and not statement.startswith('--'):
-                        try:
-                            cur.execute(statement)
-                        except Exception as e:
-                            if "already exists" not in str(e).lower() and "duplicate" not in str(e).lower():
-                                print(f"      ⚠️  {str(e)[:100]}")
+                try:
+                    cur.execute(f.read())
+                except Exception as e:
+                    print(f"      ⚠️  {str(e)[:100]}")
             
             # Verify table was created
             cur.execute("""
@@ -1,18 +1,53 @@
 """Check specific issues mentioned by user."""
 import sys
 import os
+import json
+import time
+import hashlib
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.models import Event
 from agent.url_content_analyzer import URLContentAnalyzer
 
+# Page analyses are cached on disk so re-runs don't refetch the same URLs
+_ANALYSIS_CACHE_DIR = Path(os.getenv("URL_ANALYSIS_CACHE_DIR", ".url_analysis_cache"))
+_ANALYSIS_CACHE_TTL = int(os.getenv("URL_ANALYSIS_CACHE_TTL", "86400"))  # 1 day
+
+
+def analyze_url_cached(url_analyzer: URLContentAnalyzer, url: str, event_title: str,
+                       expected_date: Optional[date]) -> Dict:
+    """URLContentAnalyzer.analyze_url with an on-disk cache keyed on its arguments."""
+    key = hashlib.sha256(f"{url}|{event_title}|{expected_date}".encode()).hexdigest()
+    cache_path = _ANALYSIS_CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - cache_path.stat().st_mtime < _ANALYSIS_CACHE_TTL:
+            analysis = json.loads(cache_path.read_text(encoding="utf-8"))
+            if analysis.get("extracted_date"):
+                analysis["extracted_date"] = date.fromisoformat(analysis["extracted_date"])
+            return analysis
+    except (OSError, ValueError):
+        pass  # No (valid) cache entry
+    
+    analysis = url_analyzer.analyze_url(url, event_title, expected_date)
+    if "error" not in analysis:  # Don't pin transient fetch failures
+        try:
+            _ANALYSIS_CACHE_DIR.mkdir(exist_ok=True)
+            tmp = cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(analysis, ensure_ascii=False, default=str), encoding="utf-8")
+            tmp.replace(cache_path)
+        except OSError as e:
+            print(f"Warning: could not write URL analysis cache: {str(e)}")
+    return analysis
+
 def check_specific_issues():
     """Check specific issues mentioned by user."""
-    db_client = DatabaseClient()
-    events_data = db_client.get_all_events(limit=2000)
-    events = [Event(**e) for e in events_data]
+    db_client = get_db()
+    url_analyzer = URLContentAnalyzer()
     
     print("=" * 80)
     print("CHECKING SPECIFIC ISSUES")
@@ -23,7 +58,9 @@ def check_specific_issues():
     state_event = None
     energy_forum = None
     
-    for event in events:
+    # Stream events page by page; only the three matches are kept
+    for event_data in db_client.iter_all_events(limit=2000):
+        event = Event(**event_data)
         title_lower = event.event_title.lower()
         if "e-government" in title_lower or "smart cities" in title_lower:
             conference_event = event
@@ -53,8 +90,7 @@ def check_specific_issues():
             print("   ❌ ISSUE: URL is /home page (generic)")
             # Try to find better URL
             print("   Attempting to find better URL...")
-            url_analyzer = URLContentAnalyzer()
-            analysis = url_analyzer.analyze_url(state_event.url, state_event.event_title, state_event.event_date)
+            analysis = analyze_url_cached(url_analyzer, state_event.url, state_event.event_title, state_event.event_date)
             if analysis.get("found_better_url"):
                 print(f"   ✅ Found better URL: {analysis['actual_url']}")
             else:
@@ -73,8 +109,7 @@ def check_specific_issues():
             print("   ❌ ISSUE: Date is Dec 5, but should be Dec 1 (start of week)")
             # Try to extract date from URL content
             print("   Attempting to extract correct date from URL content...")
-            url_analyzer = URLContentAnalyzer()
-            analysis = url_analyzer.analyze_url(energy_forum.url, energy_forum.event_title, energy_forum.event_date)
+            analysis = analyze_url_cached(url_analyzer, energy_forum.url, energy_forum.event_title, energy_forum.event_date)
             extracted_date = analysis.get("extracted_date")
             if extracted_date and extracted_date.day == 1:
                 print(f"   ✅ Found correct date in URL content: {extracted_date}")
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 """Clean up database and translate Ukrainian titles."""
 import os
+import re
+import json
 import sys
-import requests
+import asyncio
+import httpx
 from datetime import date
+from agent.keywords import keyword_matcher
 
 # Get credentials from environment or use defaults
 SUPABASE_URL = os.getenv("SUPABASE_URL", "https://qjuaqnhwpwmywgshghpq.supabase.co")
@@ -17,87 +21,227 @@ headers = {
     "Prefer": "return=representation"
 }
 
+# One pooled HTTP/2 connection to PostgREST for the whole run
+supabase_http = httpx.Client(http2=True, headers=headers, timeout=30)
+
+
+# UUIDs per DELETE; keeps the id=in.(...) query string well under proxy URL limits
+DELETE_BATCH_SIZE = 100
+
+
+# URLs to delete (spam aggregators and irrelevant events)
+_BAD_URL_PATTERNS = (
+    'conferencealerts.co.in',
+    'allconferencealert.net',
+    'internationalconferencealerts.com',
+    'conferencealert.com',
+    'waset.org',
+)
+_BAD_URL_RE = keyword_matcher(_BAD_URL_PATTERNS)
+
+_IRRELEVANT_KEYWORDS = (
+    'artificial intelligence',
+    'software engineering',
+    'machine learning',
+    'human rights in africa',
+    'cultural identity',
+    'latin american',
+    'spanish studies',
+    'teacher education',
+    'pedagogy',
+    'biotechnology',
+)
+_IRRELEVANT_RE = keyword_matcher(_IRRELEVANT_KEYWORDS)
+
+_URBAN_KEYWORDS = (
+    'urban', 'city', 'cities', 'planning', 'housing', 'recovery',
+    'reconstruction', 'municipal', 'infrastructure', 'ukraine'
+)
+_URBAN_RE = keyword_matcher(_URBAN_KEYWORDS)
+
+
+def delete_events_by_id(ids):
+    """Delete events by id, batching ids into id=in.(...) requests. Returns number deleted."""
+    deleted = 0
+    for i in range(0, len(ids), DELETE_BATCH_SIZE):
+        batch = ids[i:i + DELETE_BATCH_SIZE]
+        del_response = supabase_http.delete(
+            f"{SUPABASE_URL}/rest/v1/events?id=in.({','.join(map(str, batch))})"
+        )
+        if del_response.status_code == 200:
+            deleted += len(del_response.json())
+        else:
+            print(f"  ❌ Failed to delete {len(batch)} events: {del_response.status_code}")
+    return deleted
+
+
+# Any Ukrainian letter, either case; one C-level scan instead of a per-character loop
+_UKRAINIAN_CHAR_CLASS = "[абвгґдеєжзиіїйклмнопрстуфхцчшщьюяАБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ]"
+_UKRAINIAN_CHAR_RE = re.compile(_UKRAINIAN_CHAR_CLASS)
+
 
 def is_ukrainian(text):
     """Check if text contains Ukrainian characters."""
     if not text:
         return False
-    ukrainian_chars = "абвгґдеєжзиіїйклмнопрстуфхцчшщьюя"
-    return any(char.lower() in ukrainian_chars for char in text)
+    return _UKRAINIAN_CHAR_RE.search(text) is not None
 
 
-def translate(text, context="event title"):
-    """Translate Ukrainian to English using OpenAI."""
-    if not OPENAI_API_KEY:
-        print("  ⚠️ OPENAI_API_KEY not set, skipping translation")
-        return text
+def _translation_messages(text, context):
+    """Chat messages asking for a concise English translation."""
+    return [
+        {
+            "role": "system",
+            "content": f"You are a professional translator. Translate Ukrainian text to English. Keep it concise and professional for {context}. Return ONLY the translation, no explanations."
+        },
+        {
+            "role": "user",
+            "content": f"Translate to English: {text}"
+        }
+    ]
+
+
+# Concurrent OpenAI requests while translating
+TRANSLATION_CONCURRENCY = 16
+
+# Texts sent per batched translation request
+TRANSLATION_BATCH_SIZE = 20
+
+
+async def _translate_async(client, semaphore, text, context):
+    """Translate Ukrainian to English using OpenAI, bounded by the shared semaphore."""
+    async with semaphore:
+        try:
+            response = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=_translation_messages(text, context),
+                temperature=0.3,
+                max_tokens=200
+            )
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            print(f"  Translation error: {e}")
+            return text
+
+
+async def _translate_batch_async(client, semaphore, texts, context):
+    """Translate several texts in one request.
     
+    Falls back to one request per text if the reply doesn't line up with the input.
+    """
+    async with semaphore:
+        try:
+            response = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": f"You are a professional translator. Translate each Ukrainian {context} in the given JSON array to English. Keep them concise and professional. Return ONLY a JSON object of the form {{\"translations\": [...]}} with one translation per input, in the same order."
+                    },
+                    {
+                        "role": "user",
+                        "content": json.dumps(texts, ensure_ascii=False)
+                    }
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3,
+                max_tokens=200 * len(texts)
+            )
+            translations = json.loads(response.choices[0].message.content).get("translations")
+            if isinstance(translations, list) and len(translations) == len(texts):
+                return [str(t).strip() for t in translations]
+            print(f"  Batch translation returned mismatched output, translating {len(texts)} items one by one")
+        except Exception as e:
+            print(f"  Batch translation error: {e}")
+    return await asyncio.gather(*(_translate_async(client, semaphore, t, context) for t in texts))
+
+
+async def _translate_and_update(events):
+    """Translate Ukrainian titles/summaries in batched requests, then PATCH the changed events.
+    
+    Returns the number of events updated.
+    """
+    from openai import AsyncOpenAI
+    client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    semaphore = asyncio.Semaphore(TRANSLATION_CONCURRENCY)
+    
+    async def translate_all(texts, context):
+        batches = [texts[i:i + TRANSLATION_BATCH_SIZE] for i in range(0, len(texts), TRANSLATION_BATCH_SIZE)]
+        results = await asyncio.gather(*(_translate_batch_async(client, semaphore, b, context) for b in batches))
+        return [text for batch in results for text in batch]
+    
+    title_events = [e for e in events if is_ukrainian(e['event_title'])]
+    summary_events = [e for e in events if is_ukrainian(e.get('summary') or '')]
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        title_translations, summary_translations = await asyncio.gather(
+            translate_all([e['event_title'] for e in title_events], "event title"),
+            translate_all([e['summary'] for e in summary_events], "event description"),
+        )
+    finally:
+        await client.close()
+    new_titles = {e['id']: t for e, t in zip(title_events, title_translations)}
+    new_summaries = {e['id']: t for e, t in zip(summary_events, summary_translations)}
+    
+    async def update_event(http, event):
+        title = event['event_title']
+        summary = event.get('summary') or ''
+        new_title = new_titles.get(event['id'])
+        new_summary = new_summaries.get(event['id'])
+        
+        updates = {}
+        
+        # Translated title
+        if new_title and new_title != title:
+            updates['event_title'] = new_title
+            print(f"📝 {title[:40]}...")
+            print(f"   → {new_title[:40]}...")
+        
+        # Translated summary
+        if new_summary and new_summary != summary:
+            updates['summary'] = new_summary
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"You are a professional translator. Translate Ukrainian text to English. Keep it concise and professional for {context}. Return ONLY the translation, no explanations."
-                },
-                {
-                    "role": "user",
-                    "content": f"Translate to English: {text}"
-                }
-            ],
-            temperature=0.3,
-            max_tokens=200
+        # Update if we have changes
+        if not updates:
+            return False
+        update_response = await http.patch(
+            f"{SUPABASE_URL}/rest/v1/events?id=eq.{event['id']}",
+            json=updates
         )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        print(f"  Translation error: {e}")
-        return text
+        if update_response.status_code == 200:
+            print(f"   ✅ Updated {title[:40]}")
+            return True
+        print(f"   ❌ Failed {title[:40]}: {update_response.status_code}")
+        return False
+    
+    async with httpx.AsyncClient(http2=True, headers=headers, timeout=30) as http:
+        results = await asyncio.gather(*(update_event(http, e) for e in events))
+    return sum(results)
 
 
 def delete_bad_events():
     """Delete events from spam aggregator sites."""
-    # URLs to delete (spam aggregators and irrelevant events)
-    bad_url_patterns = [
-        'conferencealerts.co.in',
-        'allconferencealert.net',
-        'internationalconferencealerts.com',
-        'conferencealert.com',
-        'waset.org',
-    ]
-    
     print("🗑️ DELETING BAD EVENTS...")
     print("-" * 60)
     
-    # Get all events
-    response = requests.get(
-        f"{SUPABASE_URL}/rest/v1/events?select=*",
-        headers=headers
+    # Let PostgREST filter by URL and return only the columns we print
+    url_filter = ','.join(f"url.ilike.*{pattern}*" for pattern in _BAD_URL_PATTERNS)
+    response = supabase_http.get(
+        f"{SUPABASE_URL}/rest/v1/events",
+        params={"select": "id,event_title,url", "or": f"({url_filter})"}
     )
     events = response.json()
     
-    deleted = 0
+    bad_ids = []
     for event in events:
         url = event.get('url', '').lower()
         
         # Check if URL matches any bad pattern
-        if any(pattern in url for pattern in bad_url_patterns):
+        if _BAD_URL_RE.search(url):
             print(f"Deleting: {event['event_title'][:50]}...")
             print(f"  URL: {url[:60]}")
-            
-            # Delete
-            del_response = requests.delete(
-                f"{SUPABASE_URL}/rest/v1/events?id=eq.{event['id']}",
-                headers=headers
-            )
-            
-            if del_response.status_code == 200:
-                deleted += 1
-                print(f"  ✅ Deleted")
-            else:
-                print(f"  ❌ Failed: {del_response.status_code}")
+            bad_ids.append(event['id'])
+    
+    deleted = delete_events_by_id(bad_ids)
     
     print(f"\n✅ Deleted {deleted} bad events")
     return deleted
@@ -111,9 +255,8 @@ def delete_past_events():
     print("-" * 60)
     
     # Delete events before today
-    response = requests.delete(
-        f"{SUPABASE_URL}/rest/v1/events?event_date=lt.{today.isoformat()}",
-        headers=headers
+    response = supabase_http.delete(
+        f"{SUPABASE_URL}/rest/v1/events?event_date=lt.{today.isoformat()}"
     )
     
     if response.status_code == 200:
@@ -127,58 +270,47 @@ def delete_past_events():
 
 def delete_irrelevant_events():
     """Delete clearly irrelevant events."""
-    irrelevant_keywords = [
-        'artificial intelligence',
-        'software engineering',
-        'machine learning',
-        'human rights in africa',
-        'cultural identity',
-        'latin american',
-        'spanish studies',
-        'teacher education',
-        'pedagogy',
-        'biotechnology',
-    ]
-    
-    urban_keywords = [
-        'urban', 'city', 'cities', 'planning', 'housing', 'recovery',
-        'reconstruction', 'municipal', 'infrastructure', 'ukraine'
-    ]
-    
     print("\n🗑️ DELETING IRRELEVANT EVENTS...")
     print("-" * 60)
     
-    # Get all events
-    response = requests.get(
-        f"{SUPABASE_URL}/rest/v1/events?select=*",
-        headers=headers
+    # Filter and delete in one statement (database/cleanup_irrelevant.sql)
+    response = supabase_http.post(
+        f"{SUPABASE_URL}/rest/v1/rpc/cleanup_irrelevant_events",
+        json={
+            "irrelevant_keywords": list(_IRRELEVANT_KEYWORDS),
+            "urban_keywords": list(_URBAN_KEYWORDS),
+        }
+    )
+    if response.status_code == 200:
+        deleted_events = response.json()
+        for event in deleted_events:
+            print(f"Deleted irrelevant: {event['event_title'][:50]}...")
+        print(f"\n✅ Deleted {len(deleted_events)} irrelevant events")
+        return len(deleted_events)
+    
+    print(f"  ⚠️ cleanup_irrelevant_events RPC unavailable ({response.status_code}), filtering client-side")
+    
+    # Only the columns the keyword checks read
+    response = supabase_http.get(
+        f"{SUPABASE_URL}/rest/v1/events?select=id,event_title,summary"
     )
     events = response.json()
     
-    deleted = 0
+    irrelevant_ids = []
     for event in events:
         title = event.get('event_title', '').lower()
         summary = event.get('summary', '').lower()
         combined = f"{title} {summary}"
         
         # Check if irrelevant
-        is_irrelevant = any(kw in combined for kw in irrelevant_keywords)
-        has_urban = any(kw in combined for kw in urban_keywords)
+        is_irrelevant = _IRRELEVANT_RE.search(combined) is not None
+        has_urban = _URBAN_RE.search(combined) is not None
         
         if is_irrelevant and not has_urban:
             print(f"Deleting irrelevant: {event['event_title'][:50]}...")
-            
-            # Delete
-            del_response = requests.delete(
-                f"{SUPABASE_URL}/rest/v1/events?id=eq.{event['id']}",
-                headers=headers
-            )
-            
-            if del_response.status_code == 200:
-                deleted += 1
-                print(f"  ✅ Deleted")
-            else:
-                print(f"  ❌ Failed: {del_response.status_code}")
+            irrelevant_ids.append(event['id'])
+    
+    deleted = delete_events_by_id(irrelevant_ids)
     
     print(f"\n✅ Deleted {deleted} irrelevant events")
     return deleted
@@ -193,47 +325,20 @@ def translate_ukrainian_titles():
     print("\n📝 TRANSLATING UKRAINIAN TITLES...")
     print("-" * 60)
     
-    # Get all events
-    response = requests.get(
-        f"{SUPABASE_URL}/rest/v1/events?select=*&order=event_date",
-        headers=headers
+    # Only events with Ukrainian letters in the title or summary (POSIX regex match in Postgres)
+    response = supabase_http.get(
+        f"{SUPABASE_URL}/rest/v1/events",
+        params={
+            "select": "id,event_title,summary",
+            "or": f"(event_title.match.{_UKRAINIAN_CHAR_CLASS},summary.match.{_UKRAINIAN_CHAR_CLASS})",
+            "order": "event_date",
+        }
     )
     events = response.json()
     
-    translated_count = 0
-    for event in events:
-        title = event['event_title']
-        summary = event.get('summary', '')
-        event_id = event['id']
-        
-        updates = {}
-        
-        # Translate title if Ukrainian
-        if is_ukrainian(title):
-            new_title = translate(title, "event title")
-            if new_title and new_title != title:
-                updates['event_title'] = new_title
-                print(f"📝 {title[:40]}...")
-                print(f"   → {new_title[:40]}...")
-        
-        # Translate summary if Ukrainian
-        if summary and is_ukrainian(summary):
-            new_summary = translate(summary, "event description")
-            if new_summary and new_summary != summary:
-                updates['summary'] = new_summary
-        
-        # Update if we have changes
-        if updates:
-            update_response = requests.patch(
-                f"{SUPABASE_URL}/rest/v1/events?id=eq.{event_id}",
-                headers=headers,
-                json=updates
-            )
-            if update_response.status_code == 200:
-                translated_count += 1
-                print(f"   ✅ Updated")
-            else:
-                print(f"   ❌ Failed: {update_response.status_code}")
+    # Titles and summaries are translated in batches, then changed events are PATCHed concurrently
+    events = [e for e in events if is_ukrainian(e['event_title']) or is_ukrainian(e.get('summary') or '')]
+    translated_count = asyncio.run(_translate_and_update(events))
     
     print(f"\n✅ Translated {translated_count} events")
     return translated_count
@@ -246,9 +351,8 @@ def show_final_status():
     print("=" * 80)
     
     # Get all events
-    response = requests.get(
-        f"{SUPABASE_URL}/rest/v1/events?select=event_date,event_title,url&order=event_date",
-        headers=headers
+    response = supabase_http.get(
+        f"{SUPABASE_URL}/rest/v1/events?select=event_date,event_title,url&order=event_date"
     )
     events = response.json()
     
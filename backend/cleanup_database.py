@@ -20,18 +20,22 @@ import os
 import sys
 import re
 from datetime import date, datetime
-from difflib import SequenceMatcher
-from collections import defaultdict
+import numpy as np
+from rapidfuzz import fuzz, process
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
+from agent.keywords import keyword_matcher
 
 
-def similar(a: str, b: str) -> float:
-    """Calculate string similarity."""
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+# URLs per delete().in_() request; event URLs are long, so keep the query string short
+DELETE_BATCH_SIZE = 50
+
+# URL shape checks shared by score_url and is_bad_url
+_HOMEPAGE_RE = re.compile(r'^https?://[^/]+/?$')
+_MONTH_ARCHIVE_RE = re.compile(r'/\d{4}/\d{1,2}/?$')
 
 
 def score_url(url: str) -> int:
@@ -58,43 +62,59 @@ def score_url(url: str) -> int:
         score -= 60
     if 'toolkit' in url_lower and 'events' in url_lower:
         score -= 30
-    if re.match(r'^https?://[^/]+/?$', url):  # Homepage
+    if _HOMEPAGE_RE.match(url):  # Homepage
         score -= 50
-    if re.search(r'/\d{4}/\d{1,2}/?$', url):  # Month archive
+    if _MONTH_ARCHIVE_RE.search(url):  # Month archive
         score -= 40
     
     return score
 
 
+# Clearly irrelevant topics
+_IRRELEVANT_KEYWORDS = [
+    'biotechnology', 'biodiversity', 'biology',
+    'artificial intelligence', 'software engineering', 'machine learning',
+    'teacher education', 'pedagogy', 'teaching methods',
+    'spanish language', 'latin american studies', 'language studies',
+    'multilingual education', 'big data',
+    'medical research', 'healthcare',
+    'benefit concert', 'film for ukraine'
+]
+
+# Urban/recovery keywords
+_URBAN_KEYWORDS = [
+    'urban', 'city', 'planning', 'recovery', 'housing', 'reconstruction',
+    'municipal', 'local government', 'decentralization', 'energy', 'efficiency',
+    'waste', 'management', 'infrastructure', 'sustainable', 'green',
+    'rebuild', 'affordable', 'smart building'
+]
+
+# News aggregators
+_NEWS_AGGREGATORS = [
+    'kyivindependent.com',
+    'pravda.com.ua',
+    'ukrinform.ua',
+    'unian.ua',
+    'korrespondent.net'
+]
+
+
+_IRRELEVANT_RE = keyword_matcher(_IRRELEVANT_KEYWORDS)
+_URBAN_RE = keyword_matcher(_URBAN_KEYWORDS)
+_NEWS_AGGREGATOR_RE = keyword_matcher(_NEWS_AGGREGATORS)
+
+
 def is_irrelevant_event(title: str, summary: str) -> tuple[bool, str]:
     """Check if event is clearly irrelevant to urban planning/recovery."""
-    combined = f"{title.lower()} {(summary or '').lower()}"
-    
-    # Clearly irrelevant topics
-    irrelevant_keywords = [
-        'biotechnology', 'biodiversity', 'biology',
-        'artificial intelligence', 'software engineering', 'machine learning',
-        'teacher education', 'pedagogy', 'teaching methods',
-        'spanish language', 'latin american studies', 'language studies',
-        'multilingual education', 'big data',
-        'medical research', 'healthcare',
-        'benefit concert', 'film for ukraine'
-    ]
-    
-    # Urban/recovery keywords
-    urban_keywords = [
-        'urban', 'city', 'planning', 'recovery', 'housing', 'reconstruction',
-        'municipal', 'local government', 'decentralization', 'energy', 'efficiency',
-        'waste', 'management', 'infrastructure', 'sustainable', 'green',
-        'rebuild', 'affordable', 'smart building'
-    ]
-    
-    has_irrelevant = any(kw in combined for kw in irrelevant_keywords)
-    has_urban = any(kw in combined for kw in urban_keywords)
-    
-    if has_irrelevant and not has_urban:
-        matched = [kw for kw in irrelevant_keywords if kw in combined]
-        return True, f"Contains irrelevant topic: {matched[0]}"
+    combined = f"{title} {summary or ''}".lower()
+    
+    # Any urban/recovery keyword keeps the event, so there is no need to look further
+    if _URBAN_RE.search(combined):
+        return False, ""
+    
+    match = _IRRELEVANT_RE.search(combined)
+    if match:
+        return True, f"Contains irrelevant topic: {match.group(0)}"
     
     return False, ""
 
@@ -104,14 +124,7 @@ def is_bad_url(url: str) -> tuple[bool, str]:
     url_lower = url.lower()
     
     # News aggregators
-    news_aggregators = [
-        'kyivindependent.com',
-        'pravda.com.ua',
-        'ukrinform.ua',
-        'unian.ua',
-        'korrespondent.net'
-    ]
-    if any(agg in url_lower for agg in news_aggregators):
+    if _NEWS_AGGREGATOR_RE.search(url_lower):
         return True, "News aggregator"
     
     # Listing pages ending with /events
@@ -119,11 +132,11 @@ def is_bad_url(url: str) -> tuple[bool, str]:
         return True, "Listing page (/events)"
     
     # Generic homepages
-    if re.match(r'^https?://[^/]+/?$', url):
+    if _HOMEPAGE_RE.match(url):
         return True, "Homepage"
     
     # Month archive pages
-    if re.search(r'/\d{4}/\d{1,2}/?$', url):
+    if _MONTH_ARCHIVE_RE.search(url):
         return True, "Month archive"
     
     # Generic calendar pages
@@ -148,7 +161,7 @@ def main():
         print("   Dashboard > Settings > API > service_role key")
         print()
     
-    db = DatabaseClient()
+    db = get_db()
     events = db.get_upcoming_events(days=180)
     
     print(f"Total events in database: {len(events)}")
@@ -161,21 +174,25 @@ def main():
     print("STEP 1: FINDING DUPLICATES")
     print("=" * 80)
     
-    title_groups = defaultdict(list)
-    for e in events:
-        title = e.get('event_title', '')
-        found_group = False
-        for key in title_groups:
-            if similar(title, key) > 0.85:
-                title_groups[key].append(e)
-                found_group = True
-                break
-        if not found_group:
-            title_groups[title].append(e)
+    # All pairwise title similarities (0-100) in one vectorized call
+    titles = [e.get('event_title', '').lower() for e in events]
+    scores = process.cdist(titles, titles, scorer=fuzz.ratio, score_cutoff=85, workers=-1)
+    
+    # Each event joins the first group whose leading title is similar enough
+    leaders = []
+    title_groups = {}
+    for i, e in enumerate(events):
+        matches = np.flatnonzero(scores[i, leaders] > 85) if leaders else []
+        if len(matches):
+            title_groups[leaders[matches[0]]].append(e)
+        else:
+            leaders.append(i)
+            title_groups[i] = [e]
     
     duplicates_to_remove = []
-    for title, group in title_groups.items():
+    for leader, group in title_groups.items():
         if len(group) > 1:
+            title = events[leader].get('event_title', '')
             # Sort by URL score (best first)
             group.sort(key=lambda x: score_url(x.get('url', '')), reverse=True)
             # Keep first, remove rest
@@ -197,13 +214,11 @@ def main():
     
     irrelevant_events = []
     for e in events:
-        is_irrelevant, reason = is_irrelevant_event(
-            e.get('event_title', ''),
-            e.get('summary', '')
-        )
+        title = e.get('event_title', '')
+        is_irrelevant, reason = is_irrelevant_event(title, e.get('summary', ''))
         if is_irrelevant:
             irrelevant_events.append(e)
-            print(f"  {e.get('event_title', '')[:50]}...")
+            print(f"  {title[:50]}...")
             print(f"    Reason: {reason}")
     
     print(f"\nIrrelevant to remove: {len(irrelevant_events)}")
@@ -218,11 +233,12 @@ def main():
     
     bad_url_events = []
     for e in events:
-        is_bad, reason = is_bad_url(e.get('url', ''))
+        url = e.get('url', '')
+        is_bad, reason = is_bad_url(url)
         if is_bad:
             bad_url_events.append(e)
             print(f"  {e.get('event_title', '')[:40]}...")
-            print(f"    URL: {e.get('url', '')[:60]}")
+            print(f"    URL: {url[:60]}")
             print(f"    Reason: {reason}")
     
     print(f"\nBad URL events: {len(bad_url_events)}")
@@ -265,23 +281,33 @@ def main():
     # Remove events
     print()
     print("Removing events...")
-    removed_count = 0
-    failed_count = 0
+    url_list = list(urls_to_remove)
+    chunks = [url_list[i:i + DELETE_BATCH_SIZE] for i in range(0, len(url_list), DELETE_BATCH_SIZE)]
+    for chunk in chunks:
+        try:
+            db.client.table("events").delete().in_("url", chunk).execute()
+        except Exception as e:
+            print(f"  ❌ Error deleting {len(chunk)} events: {e}")
     
-    for url in urls_to_remove:
+    # Check once for anything that survived (the anon key silently deletes nothing)
+    still_present = set()
+    for chunk in chunks:
         try:
-            result = db.client.table("events").delete().eq("url", url).execute()
-            # Check if actually deleted
-            check = db.client.table("events").select("url").eq("url", url).execute()
-            if not check.data:
-                removed_count += 1
-                print(f"  ✅ Removed: {url[:60]}")
-            else:
-                failed_count += 1
-                print(f"  ❌ Failed (still exists): {url[:60]}")
+            check = db.client.table("events").select("url").in_("url", chunk).execute()
+            still_present.update(row["url"] for row in check.data or [])
         except Exception as e:
+            still_present.update(chunk)
+            print(f"  ❌ Error checking {len(chunk)} deletions: {e}")
+    
+    removed_count = 0
+    failed_count = 0
+    for url in url_list:
+        if url in still_present:
             failed_count += 1
-            print(f"  ❌ Error: {url[:40]} - {e}")
+            print(f"  ❌ Failed (still exists): {url[:60]}")
+        else:
+            removed_count += 1
+            print(f"  ✅ Removed: {url[:60]}")
     
     print()
     print("=" * 80)
@@ -303,4 +329,3 @@ if __name__ == "__main__":
     main()
 
 
-
@@ -1,17 +1,91 @@
 """Clean up existing events using new filters (duplicates, news, URL validation)."""
 import sys
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import date, timedelta
+from dataclasses import dataclass
+from rapidfuzz import fuzz
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.duplicate_detector import DuplicateDetector
-from agent.url_validator import URLValidator
+from agent.url_validator import URLValidator, install_dns_cache
 from agent.translator import Translator
 from agent.date_validator import DateValidator
+from agent.keywords import keyword_matcher
+
+
+# Event ids per delete().in_() request
+DELETE_BATCH_SIZE = 100
+
+# Concurrent OpenAI requests when translating Ukrainian fields
+TRANSLATION_WORKERS = 16
+
+# Rows per translation upsert (sent as a JSON body, so no URL length concern)
+UPSERT_BATCH_SIZE = 500
+
+
+# Indicator lists for the news and local-event filters, compiled once
+_NEWS_RE = keyword_matcher(["news", "article", "blog", "report", "analysis", "opinion", "announcement"])
+_EVENT_RE = keyword_matcher(["conference", "workshop", "seminar", "webinar", "forum", "training", "meeting", "event", "symposium", "summit"])
+_LAUNCH_RE = keyword_matcher(["starting", "launch", "beginning", "new program", "new housing", "compensation program"])
+_NEWS_SUMMARY_RE = keyword_matcher(["news article", "blog post", "reports that", "according to news", "starting december", "starting january"])
+_NEWS_DOMAIN_RE = keyword_matcher(["korrespondent.net", "freeradio.com.ua", "mindev.gov.ua/news"])
+_LOCAL_RE = keyword_matcher([
+    "засідання архітектурно", "засідання містобудівної ради",
+    "council meeting", "обласна рада"
+])
+_MAJOR_RE = keyword_matcher(["conference", "forum", "summit", "конференція", "форум"])
+_NEWS_PATH_RE = keyword_matcher(["/news/", "/article/", "/blog/"])
+
+
+def _excluding(events, removed):
+    """Events not in removed, checked by identity instead of comparing whole dicts."""
+    removed_ids = {id(e) for e in removed}
+    return [e for e in events if id(e) not in removed_ids]
+
+
+def _parse_event_date(value):
+    """event_date as a date object, or None if missing/unparseable."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+    return value
+
+
+def _title_ratio(title1: str, title2: str) -> float:
+    """rapidfuzz's (C++) normalized Indel similarity, scaled to 0-1 like SequenceMatcher.ratio()."""
+    return fuzz.ratio(title1, title2) / 100
+
+
+@dataclass(slots=True)
+class _Event:
+    """A fetched event row plus the fields every filter step reads, derived once."""
+    row: dict
+    title: str
+    title_l: str
+    summary_l: str
+    url_l: str
+    event_date: Optional[date]
+
+    @classmethod
+    def from_row(cls, row: dict) -> "_Event":
+        title = row.get("event_title", "")
+        return cls(
+            row=row,
+            title=title,
+            title_l=title.lower(),
+            summary_l=(row.get("summary") or "").lower(),
+            url_l=row.get("url", "").lower(),
+            event_date=_parse_event_date(row.get("event_date")),
+        )
 
 
 def cleanup_events():
@@ -22,23 +96,21 @@ def cleanup_events():
     print()
     
     try:
-        db_client = DatabaseClient()
-        duplicate_detector = DuplicateDetector(title_similarity_threshold=0.85, date_tolerance_days=0)
-        url_validator = URLValidator(timeout=5, max_redirects=5)
+        db_client = get_db()
+        duplicate_detector = DuplicateDetector(
+            title_similarity_threshold=0.85,
+            date_tolerance_days=0,
+            scorer=_title_ratio
+        )
+        url_validator = URLValidator(timeout=5, max_redirects=5, max_workers=50)
         translator = Translator()
         date_validator = DateValidator()
         
         print("✅ Connected to database")
         print()
         
-        # Get all events
-        print("Fetching all events from database...")
-        all_events = db_client.get_events(limit=1000)
-        print(f"Found {len(all_events)} events")
-        print()
-        
         stats = {
-            "total_events": len(all_events),
+            "total_events": 0,
             "duplicates_removed": 0,
             "invalid_urls_removed": 0,
             "news_removed": 0,
@@ -51,45 +123,57 @@ def cleanup_events():
         }
         
         # Step 1: Remove duplicates (improved - also check by URL similarity)
+        # Events are streamed page by page and deduplicated as they arrive, so the full
+        # table is never held alongside the kept list
+        print("Fetching events from database page by page...")
         print("Step 1: Checking for duplicates...")
         seen_events = []
         duplicates_to_remove = []
         seen_urls = set()
-        
-        for event in all_events:
+        # is_duplicate never matches dates further apart than the detector's tolerance,
+        # so each event is only compared against seen events from nearby dates
+        seen_by_date = {}
+        tolerance = duplicate_detector.date_tolerance_days
+        
+        for row in db_client.iter_all_events(page_size=500, limit=1000):
+            stats["total_events"] += 1
+            event = _Event.from_row(row)
             is_duplicate = False
-            event_url = event.get("url", "").lower().strip()
+            event_url = event.url_l.strip()
+            event_date = event.event_date
             
             # Check for exact URL duplicates
             if event_url in seen_urls:
                 is_duplicate = True
                 duplicates_to_remove.append(event)
                 stats["duplicates_removed"] += 1
-                print(f"  ⚠️  Duplicate URL: {event.get('event_title', '')[:60]}...")
-            else:
+                print(f"  ⚠️  Duplicate URL: {event.title[:60]}...")
+            elif event_date:
+                candidates = [
+                    seen_event
+                    for offset in range(-tolerance, tolerance + 1)
+                    for seen_event in seen_by_date.get(event_date + timedelta(days=offset), ())
+                ]
                 # Check for title+date duplicates
-                for seen_event in seen_events:
+                for seen_event in candidates:
                     if duplicate_detector.is_duplicate(
-                        {
-                            "event_title": event.get("event_title", ""),
-                            "event_date": event.get("event_date", "")
-                        },
-                        {
-                            "event_title": seen_event.get("event_title", ""),
-                            "event_date": seen_event.get("event_date", "")
-                        }
+                        {"event_title": event.title, "event_date": event_date},
+                        {"event_title": seen_event.title, "event_date": seen_event.event_date}
                     ):
                         is_duplicate = True
                         duplicates_to_remove.append(event)
                         stats["duplicates_removed"] += 1
-                        print(f"  ⚠️  Duplicate title+date: {event.get('event_title', '')[:60]}...")
+                        print(f"  ⚠️  Duplicate title+date: {event.title[:60]}...")
                         break
             
             if not is_duplicate:
                 seen_events.append(event)
                 if event_url:
                     seen_urls.add(event_url)
+                if event_date:
+                    seen_by_date.setdefault(event_date, []).append(event)
         
+        print(f"  Found {stats['total_events']} events")
         print(f"  Found {stats['duplicates_removed']} duplicates")
         print()
         
@@ -102,21 +186,13 @@ def cleanup_events():
         past_events_count = 0
         future_events_to_remove = []
         for event in seen_events:
-            event_date_str = event.get("event_date")
-            if event_date_str:
-                if isinstance(event_date_str, str):
-                    try:
-                        event_date = date.fromisoformat(event_date_str)
-                    except:
-                        continue
-                else:
-                    event_date = event_date_str
-                
+            event_date = event.event_date
+            if event_date:
                 # Only remove events that are TOO FAR in the future (likely errors)
                 if event_date > six_months_later:
                     future_events_to_remove.append(event)
                     stats["past_events_removed"] += 1
-                    print(f"  ⚠️  Too far future event (removing): {event.get('event_title', '')[:60]}... (date: {event_date})")
+                    print(f"  ⚠️  Too far future event (removing): {event.title[:60]}... (date: {event_date})")
                 elif event_date < today:
                     # Past events are KEPT for archive - just log them
                     past_events_count += 1
@@ -126,112 +202,98 @@ def cleanup_events():
         print()
         
         # Only remove events too far in the future, NOT past events
-        events_to_check = [e for e in seen_events if e not in future_events_to_remove]
+        events_to_check = _excluding(seen_events, future_events_to_remove)
         
         # Step 3: Filter out news articles (improved detection)
         print("Step 3: Filtering out news articles...")
         news_to_remove = []
         
         for event in events_to_check:
-            title = event.get("event_title", "").lower()
-            summary = event.get("summary", "").lower() if event.get("summary") else ""
-            url = event.get("url", "").lower()
+            title = event.title_l
+            summary = event.summary_l
             
-            # Check for news indicators
-            news_indicators = ["news", "article", "blog", "report", "analysis", "opinion", "announcement"]
-            event_indicators = ["conference", "workshop", "seminar", "webinar", "forum", "training", "meeting", "event", "symposium", "summit"]
+            # Clear event indicators in the title (checked by every rule below)
+            has_event = _EVENT_RE.search(title) is not None
             
             # Check if it's a program/announcement launch (not an event)
-            launch_phrases = ["starting", "launch", "beginning", "new program", "new housing", "compensation program"]
-            if any(phrase in title or phrase in summary for phrase in launch_phrases):
+            if _LAUNCH_RE.search(title) or _LAUNCH_RE.search(summary):
                 # Only remove if it doesn't have clear event indicators
-                if not any(indicator in title for indicator in event_indicators):
+                if not has_event:
                     news_to_remove.append(event)
                     stats["news_removed"] += 1
-                    print(f"  ⚠️  Program announcement (not event): {event.get('event_title', '')[:60]}...")
+                    print(f"  ⚠️  Program announcement (not event): {event.title[:60]}...")
                     continue
             
             # If title has news indicators but no event indicators, likely news
-            has_news = any(indicator in title for indicator in news_indicators)
-            has_event = any(indicator in title for indicator in event_indicators)
+            has_news = _NEWS_RE.search(title) is not None
             
             if has_news and not has_event:
                 news_to_remove.append(event)
                 stats["news_removed"] += 1
-                print(f"  ⚠️  News article: {event.get('event_title', '')[:60]}...")
+                print(f"  ⚠️  News article: {event.title[:60]}...")
                 continue
             
             # Check summary for news-like content
             if summary:
-                if any(phrase in summary for phrase in ["news article", "blog post", "reports that", "according to news", "starting december", "starting january"]):
+                if _NEWS_SUMMARY_RE.search(summary):
                     # But allow if it's clearly an event
-                    if not any(indicator in title for indicator in event_indicators):
+                    if not has_event:
                         news_to_remove.append(event)
                         stats["news_removed"] += 1
-                        print(f"  ⚠️  News article (summary): {event.get('event_title', '')[:60]}...")
+                        print(f"  ⚠️  News article (summary): {event.title[:60]}...")
                         continue
             
             # Check URL for news sites
-            news_domains = ["korrespondent.net", "freeradio.com.ua", "mindev.gov.ua/news"]
-            if any(domain in url for domain in news_domains):
+            if _NEWS_DOMAIN_RE.search(event.url_l):
                 # Only remove if it doesn't have clear event indicators
-                if not any(indicator in title for indicator in event_indicators):
+                if not has_event:
                     news_to_remove.append(event)
                     stats["news_removed"] += 1
-                    print(f"  ⚠️  News site (not event page): {event.get('event_title', '')[:60]}...")
+                    print(f"  ⚠️  News site (not event page): {event.title[:60]}...")
                     continue
         
         print(f"  Found {stats['news_removed']} news articles")
         print()
         
         # Remove news from events to check
-        events_to_validate = [e for e in events_to_check if e not in news_to_remove]
+        events_to_validate = _excluding(events_to_check, news_to_remove)
         
         # Step 3.5: Filter out local/narrow events
         print("Step 3.5: Filtering out local/narrow events...")
         local_events_to_remove = []
         
         for event in events_to_validate:
-            title = event.get("event_title", "").lower()
-            
             # Check for local indicators
-            local_indicators = [
-                "засідання архітектурно", "засідання містобудівної ради",
-                "council meeting", "обласна рада"
-            ]
-            major_indicators = ["conference", "forum", "summit", "конференція", "форум"]
-            
-            has_local = any(indicator in title for indicator in local_indicators)
-            has_major = any(indicator in title for indicator in major_indicators)
+            has_local = _LOCAL_RE.search(event.title_l) is not None
+            has_major = _MAJOR_RE.search(event.title_l) is not None
             
             # Exclude if local but not major
             if has_local and not has_major:
                 local_events_to_remove.append(event)
                 stats["local_events_removed"] += 1
-                print(f"  ⚠️  Local event: {event.get('event_title', '')[:60]}...")
+                print(f"  ⚠️  Local event: {event.title[:60]}...")
         
         print(f"  Found {stats['local_events_removed']} local events")
         print()
         
         # Remove local events
-        events_to_validate = [e for e in events_to_validate if e not in local_events_to_remove]
+        events_to_validate = _excluding(events_to_validate, local_events_to_remove)
         
         # Step 3.6: Filter out news article URLs
         print("Step 3.6: Filtering out events with news article URLs...")
         news_url_events = []
         
         for event in events_to_validate:
-            url = event.get("url", "").lower()
-            if "/news/" in url or "/article/" in url or "/blog/" in url:
+            if _NEWS_PATH_RE.search(event.url_l):
                 news_url_events.append(event)
                 stats["news_urls_removed"] += 1
-                print(f"  ⚠️  News article URL: {event.get('event_title', '')[:60]}...")
+                print(f"  ⚠️  News article URL: {event.title[:60]}...")
         
         print(f"  Found {stats['news_urls_removed']} events with news URLs")
         print()
         
         # Remove news URL events
-        events_to_validate = [e for e in events_to_validate if e not in news_url_events]
+        events_to_validate = _excluding(events_to_validate, news_url_events)
         
         # Step 4: Check for past events (validate dates) - KEEP past events for archive
         # NOTE: Past events are NOT deleted - they are kept and hidden in the UI
@@ -239,22 +301,9 @@ def cleanup_events():
         past_events_logged = 0
         
         for event in events_to_validate:
-            url = event.get("url", "")
-            event_date_str = event.get("event_date", "")
-            
-            if url and event_date_str:
-                try:
-                    if isinstance(event_date_str, str):
-                        event_date = date.fromisoformat(event_date_str)
-                    else:
-                        event_date = event_date_str
-                    
-                    # Just log past events, don't remove them
-                    if event_date < today:
-                        past_events_logged += 1
-                except Exception as e:
-                    # Skip if date parsing fails
-                    pass
+            # Just log past events, don't remove them (unparseable dates are None)
+            if event.url_l and event.event_date and event.event_date < today:
+                past_events_logged += 1
         
         print(f"  Found {past_events_logged} past events (kept for archive)")
         print()
@@ -265,34 +314,36 @@ def cleanup_events():
         print("Step 5: Translating Ukrainian events to English...")
         events_to_update = []
         
+        # Collect every Ukrainian field first; identical (text, context) pairs, such as a
+        # recurring organizer, are translated only once
+        translatable_fields = (
+            ("event_title", "event title"),
+            ("organizer", "organizer name"),
+            ("summary", "event description"),
+        )
+        pending = {}
+        for event in events_to_validate:
+            for field, context in translatable_fields:
+                text = event.row.get(field, "")
+                if text and translator.is_ukrainian(text):
+                    pending[(text, context)] = None
+        
+        # Each translation is an independent OpenAI request, so run them concurrently
+        with ThreadPoolExecutor(max_workers=TRANSLATION_WORKERS) as executor:
+            translations = dict(zip(pending, executor.map(lambda key: translator.translate(*key), pending)))
+        
         for event in events_to_validate:
-            needs_update = False
             updates = {}
+            for field, context in translatable_fields:
+                text = event.row.get(field, "")
+                translated = translations.get((text, context), text)
+                if translated != text:
+                    updates[field] = translated
+                    if field == "event_title":
+                        stats["translated"] += 1
+                        print(f"  ✅ Translated: {text[:40]}... → {translated[:40]}...")
             
-            title = event.get("event_title", "")
-            if translator.is_ukrainian(title):
-                translated = translator.translate(title, "event title")
-                if translated != title:
-                    updates["event_title"] = translated
-                    needs_update = True
-                    stats["translated"] += 1
-                    print(f"  ✅ Translated: {title[:40]}... → {translated[:40]}...")
-            
-            organizer = event.get("organizer", "")
-            if organizer and translator.is_ukrainian(organizer):
-                translated = translator.translate(organizer, "organizer name")
-                if translated != organizer:
-                    updates["organizer"] = translated
-                    needs_update = True
-            
-            summary = event.get("summary", "")
-            if summary and translator.is_ukrainian(summary):
-                translated = translator.translate(summary, "event description")
-                if translated != summary:
-                    updates["summary"] = translated
-                    needs_update = True
-            
-            if needs_update:
+            if updates:
                 events_to_update.append((event, updates))
         
         print(f"  Translated {stats['translated']} events")
@@ -302,47 +353,48 @@ def cleanup_events():
         print("Step 4: Validating URLs...")
         invalid_url_events = []
         
-        # Collect URLs to validate
-        urls_to_validate = []
+        # Collect URLs to validate; duplicate events often share URLs, so each is checked once
+        urls_to_validate = {}
         for event in events_to_validate:
-            url = event.get("url")
+            url = event.row.get("url")
             if url:
-                urls_to_validate.append(url)
-            reg_url = event.get("registration_url")
+                urls_to_validate[url] = None
+            reg_url = event.row.get("registration_url")
             if reg_url and reg_url != url:
-                urls_to_validate.append(reg_url)
+                urls_to_validate[reg_url] = None
         
-        print(f"  Validating {len(urls_to_validate)} URLs...")
-        url_results = url_validator.validate_urls(urls_to_validate, check_accessibility=True)
+        print(f"  Validating {len(urls_to_validate)} unique URLs...")
+        url_results = url_validator.validate_urls(list(urls_to_validate), check_accessibility=True)
         
         for event in events_to_validate:
-            url = event.get("url")
+            url = event.row.get("url")
             if url:
                 is_valid, error = url_results.get(url, (False, "Not checked"))
                 if not is_valid:
                     invalid_url_events.append(event)
                     stats["invalid_urls_removed"] += 1
-                    print(f"  ⚠️  Invalid URL: {event.get('event_title', '')[:60]}... ({error})")
+                    print(f"  ⚠️  Invalid URL: {event.title[:60]}... ({error})")
         
         print(f"  Found {stats['invalid_urls_removed']} events with invalid URLs")
         print()
         
         # Final valid events
-        valid_events = [e for e in events_to_validate if e not in invalid_url_events]
+        valid_events = _excluding(events_to_validate, invalid_url_events)
         stats["valid_events"] = len(valid_events)
         
         # Step 7: Update translated events
         print("Step 7: Updating translated events in database...")
+        # Upsert whole rows (fetched with select *) so every NOT NULL column is present
+        # and all rows share the same keys, as a bulk upsert requires
+        rows_to_update = [{**event.row, **updates} for event, updates in events_to_update if event.row.get("id")]
         updated_count = 0
-        for event, updates in events_to_update:
+        for i in range(0, len(rows_to_update), UPSERT_BATCH_SIZE):
+            batch = rows_to_update[i:i + UPSERT_BATCH_SIZE]
             try:
-                event_id = event.get("id")
-                if event_id:
-                    result = db_client.client.table("events").update(updates).eq("id", event_id).execute()
-                    if result.data:
-                        updated_count += 1
+                result = db_client.client.table("events").upsert(batch, on_conflict="id").execute()
+                updated_count += len(result.data or [])
             except Exception as e:
-                stats["errors"].append(f"Error updating event {event.get('event_title', 'Unknown')}: {str(e)}")
+                stats["errors"].append(f"Error updating {len(batch)} translated events: {str(e)}")
         
         print(f"  Updated {updated_count} events with translations")
         print()
@@ -351,17 +403,16 @@ def cleanup_events():
         print("Step 8: Removing invalid events from database...")
         events_to_delete = duplicates_to_remove + future_events_to_remove + news_to_remove + invalid_url_events + local_events_to_remove + news_url_events
         
+        # Delete by id in batches, one request per DELETE_BATCH_SIZE events
+        ids_to_delete = list(dict.fromkeys(e.row.get("id") for e in events_to_delete if e.row.get("id")))
         deleted_count = 0
-        for event in events_to_delete:
+        for i in range(0, len(ids_to_delete), DELETE_BATCH_SIZE):
+            batch = ids_to_delete[i:i + DELETE_BATCH_SIZE]
             try:
-                event_id = event.get("id")
-                if event_id:
-                    # Delete from database
-                    result = db_client.client.table("events").delete().eq("id", event_id).execute()
-                    if result.data:
-                        deleted_count += 1
+                result = db_client.client.table("events").delete().in_("id", batch).execute()
+                deleted_count += len(result.data or [])
             except Exception as e:
-                stats["errors"].append(f"Error deleting event {event.get('event_title', 'Unknown')}: {str(e)}")
+                stats["errors"].append(f"Error deleting {len(batch)} events: {str(e)}")
         
         print(f"  Deleted {deleted_count} invalid events")
         print()
@@ -398,5 +449,6 @@ def cleanup_events():
 
 
 if __name__ == "__main__":
+    install_dns_cache()  # Bulk URL checks repeat the same hosts
     exit(cleanup_events())
 
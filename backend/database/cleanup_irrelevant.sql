@@ -0,0 +1,16 @@
+-- SQL function used by cleanup_and_translate.py to delete irrelevant events server-side
+-- Run this in Supabase SQL Editor (Dashboard > SQL Editor)
+
+-- Deletes events whose title/summary mention an irrelevant topic but no urban/recovery
+-- keyword, and returns the deleted rows. Keyword lists are passed in by the caller.
+CREATE OR REPLACE FUNCTION cleanup_irrelevant_events(irrelevant_keywords TEXT[], urban_keywords TEXT[])
+RETURNS SETOF events
+LANGUAGE sql
+AS $$
+    DELETE FROM events
+    WHERE lower(event_title || ' ' || coalesce(summary, '')) LIKE ANY (
+              SELECT '%' || kw || '%' FROM unnest(irrelevant_keywords) AS kw)
+      AND NOT lower(event_title || ' ' || coalesce(summary, '')) LIKE ANY (
+              SELECT '%' || kw || '%' FROM unnest(urban_keywords) AS kw)
+    RETURNING *;
+$$;
@@ -1,44 +1,98 @@
 """Supabase database client for event storage."""
 import os
-from typing import List, Optional
+import re
+import time
+import random
+import functools
+import json
+import hashlib
+from pathlib import Path
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import httpx
+from postgrest.exceptions import APIError
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from agent.keywords import keyword_matcher
 
 load_dotenv()
 
-# Ukrainian/Cyrillic characters for detection (includes all Cyrillic that might appear)
-_UKR_CHARS = 'абвгґдеєжзиіїйклмнопрстуфхцчшщьюяАБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ'
-# Also check for Cyrillic letters that look like Latin (а, е, і, о, р, с, у, х)
-_CYRILLIC_LOOKALIKES = 'аеіорсухАЕІОРСУХ'
+# Rows per bulk upsert request in upsert_events
+UPSERT_BATCH_SIZE = 500
+
+# URLs per .in_("url", ...) request (deletes and lookups); they go in the query
+# string, so keep it modest
+URL_BATCH_SIZE = 100
+
+# Any character in the Cyrillic block (0x0400-0x04FF), which covers all Ukrainian
+# letters as well as Cyrillic lookalikes of Latin letters (а, е, і, о, р, с, у, х)
+_CYRILLIC_RE = re.compile('[\u0400-\u04FF]')
 
 def _is_ukrainian(text: str) -> bool:
     """Check if text contains Ukrainian/Cyrillic characters."""
-    if not text:
-        return False
-    # Check for obvious Ukrainian
-    if any(c in text for c in _UKR_CHARS):
-        return True
-    # Check for Cyrillic lookalikes by comparing char codes
-    for c in text:
-        # Cyrillic range: 0x0400-0x04FF
-        if 0x0400 <= ord(c) <= 0x04FF:
-            return True
-    return False
+    return bool(text) and _CYRILLIC_RE.search(text) is not None
+
+# Translations are stable, so they're kept on disk (no TTL) and reused across runs
+_TRANSLATION_CACHE_DIR = Path(os.getenv("TRANSLATION_CACHE_DIR", ".translation_cache"))
+_translation_memo: Dict[Tuple[str, str], str] = {}
+
+def _translation_cache_path(text: str, context: str) -> Path:
+    key = hashlib.sha256(f"{context}|{text}".encode()).hexdigest()
+    return _TRANSLATION_CACHE_DIR / f"{key}.json"
+
+def _cached_translation(text: str, context: str) -> Optional[str]:
+    """Previously stored translation of text, or None."""
+    memo_key = (text, context)
+    if memo_key in _translation_memo:
+        return _translation_memo[memo_key]
+    try:
+        result = json.loads(_translation_cache_path(text, context).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None  # Not translated before
+    _translation_memo[memo_key] = result
+    return result
+
+def _store_translation(text: str, context: str, result: str) -> None:
+    _translation_memo[(text, context)] = result
+    cache_path = _translation_cache_path(text, context)
+    try:
+        _TRANSLATION_CACHE_DIR.mkdir(exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(cache_path)
+    except OSError as e:
+        print(f"  ⚠️ Could not write translation cache: {str(e)[:50]}")
+
+# Built on first use and reused, so translations share one HTTP connection pool
+_openai_client = None
+
+def _get_openai():
+    """The shared OpenAI client (imported and constructed lazily)."""
+    global _openai_client
+    if _openai_client is None:
+        from openai import OpenAI
+        _openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _openai_client
 
 def _translate_text(text: str, context: str = "text") -> str:
-    """Translate Ukrainian text to English using OpenAI."""
+    """Translate Ukrainian text to English using OpenAI (cached in memory and on disk)."""
     if not text or not _is_ukrainian(text):
         return text
     
+    cached = _cached_translation(text, context)
+    if cached is not None:
+        return cached
+    return _request_translation(text, context)
+
+def _request_translation(text: str, context: str) -> str:
+    """Ask OpenAI for a translation of text already known to be Ukrainian and uncached."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print(f"  ⚠️ OPENAI_API_KEY not set - cannot translate: {text[:30]}...")
         return text
     
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-        resp = client.chat.completions.create(
+        resp = _get_openai().chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": f"Translate this {context} from Ukrainian to English. Return ONLY the translation, no quotes or explanations."},
@@ -49,13 +103,61 @@ def _translate_text(text: str, context: str = "text") -> str:
         )
         result = resp.choices[0].message.content.strip().strip('"\'')
         print(f"  🔄 DB Translated: {text[:25]}... → {result[:25]}...")
+        _store_translation(text, context, result)
         return result
     except Exception as e:
         print(f"  ⚠️ Translation error: {str(e)[:50]}")
         return text
 
+def _translate_fields(fields: Dict[str, Tuple[str, str]]) -> Dict[str, str]:
+    """
+    Translate several Ukrainian fields of one event with a single OpenAI request.
+    
+    Args:
+        fields: Field name -> (text, context) for each field to translate (already known to be Ukrainian)
+        
+    Returns:
+        Field name -> translated text (original text where translation failed)
+    """
+    translated = {}
+    pending = {}
+    for name, (text, context) in fields.items():
+        cached = _cached_translation(text, context)
+        if cached is not None:
+            translated[name] = cached
+        else:
+            pending[name] = (text, context)
+    
+    if len(pending) > 1 and os.getenv("OPENAI_API_KEY"):
+        try:
+            descriptions = ", ".join(f'"{name}" ({context})' for name, (_, context) in pending.items())
+            resp = _get_openai().chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": f"Translate the values of this JSON object from Ukrainian to English. Fields: {descriptions}. Return ONLY a JSON object with the same keys and the translated values."},
+                    {"role": "user", "content": json.dumps({name: text for name, (text, _) in pending.items()}, ensure_ascii=False)}
+                ],
+                response_format={"type": "json_object"},
+                max_tokens=300 * len(pending),
+                temperature=0.3
+            )
+            results = json.loads(resp.choices[0].message.content)
+            if set(results) == set(pending) and all(isinstance(v, str) for v in results.values()):
+                for name, (text, context) in pending.items():
+                    result = results[name].strip().strip('"\'')
+                    print(f"  🔄 DB Translated: {text[:25]}... → {result[:25]}...")
+                    _store_translation(text, context, result)
+                    translated[name] = result
+                return translated
+            print("  ⚠️ Batched translation returned unexpected keys, translating fields one by one")
+        except Exception as e:
+            print(f"  ⚠️ Batched translation error: {str(e)[:50]}")
+    
+    # Single field, no API key or batch failure: one request per field
+    for name, (text, context) in pending.items():
+        translated[name] = _request_translation(text, context)
+    return translated
 
-import re
 
 # Spam/invalid URL patterns
 _SPAM_SITES = [
@@ -75,6 +177,13 @@ _LISTING_PATTERNS = [
     '/past-events', '/archive/', '/event-list', '/upcoming-events'
 ]
 
+_SPAM_RE = keyword_matcher(_SPAM_SITES)
+_NEWS_RE = keyword_matcher(_NEWS_SITES)
+_LISTING_RE = keyword_matcher(_LISTING_PATTERNS)
+_DATE_PATH_RE = re.compile(r'/\d{4}/\d{2}/\d{2}/')
+# Legitimate event domains that use dated URLs
+_DATE_PATH_WHITELIST_RE = keyword_matcher(['facebook.com', 'instagram.com', 'gov.ua', 'irf.ua', 'rada.gov.ua'])
+
 # Allowed cities for local events (UN-Habitat recovery focus)
 _ALLOWED_CITIES = [
     'stryi', 'стрий', 'makariv', 'макарів', 'borodianka', 'бородянка',
@@ -93,36 +202,35 @@ _LOCAL_CITIES_TO_EXCLUDE = [
     'kropyvnytskyi', 'кропивниц'
 ]
 
+# National/international events are always allowed
+_NATIONAL_INDICATORS = [
+    'national', 'international', 'all-ukrainian', 'всеукраїн',
+    'ukraine', 'україн', 'european', 'європ'
+]
+
+_LOCAL_CITY_RE = keyword_matcher(_LOCAL_CITIES_TO_EXCLUDE)
+_ALLOWED_CITY_RE = keyword_matcher(_ALLOWED_CITIES)
+_NATIONAL_RE = keyword_matcher(_NATIONAL_INDICATORS)
+
 def _is_local_event(title: str, organizer: str) -> bool:
     """Check if event is a local event from excluded cities."""
     combined = f"{title} {organizer or ''}".lower()
     
-    # Check if from excluded local city
-    is_local = any(city in combined for city in _LOCAL_CITIES_TO_EXCLUDE)
-    
-    # Check if from allowed city
-    is_allowed = any(city in combined for city in _ALLOWED_CITIES)
-    
-    # Check if national/international (always allowed)
-    national_indicators = ['national', 'international', 'all-ukrainian', 'всеукраїн', 
-                           'ukraine', 'україн', 'european', 'європ']
-    is_national = any(ind in combined for ind in national_indicators)
-    
-    # Reject if local and not allowed and not national
-    return is_local and not is_allowed and not is_national
+    # Reject if from an excluded local city, unless from an allowed city or national
+    return (
+        _LOCAL_CITY_RE.search(combined) is not None
+        and not _ALLOWED_CITY_RE.search(combined)
+        and not _NATIONAL_RE.search(combined)
+    )
+
+# Years in titles like "2024", "2023", etc.
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
 
 def _has_past_year_in_title(title: str) -> bool:
     """Check if title contains a past year (indicates past event)."""
-    from datetime import datetime
-    current_year = datetime.now().year
-    
-    # Find years in title like "2024", "2023", etc.
-    years_in_title = re.findall(r'\b(20\d{2})\b', title)
-    for year_str in years_in_title:
-        year = int(year_str)
-        if year < current_year:
-            return True
-    return False
+    current_year = date.today().year
+    # Stops at the first past year found
+    return any(int(year) < current_year for year in _YEAR_RE.findall(title))
 
 def _is_valid_url(url: str) -> tuple:
     """
@@ -135,33 +243,53 @@ def _is_valid_url(url: str) -> tuple:
     url_lower = url.lower()
     
     # Check spam sites
-    for spam in _SPAM_SITES:
-        if spam in url_lower:
-            return False, f"Spam site: {spam}"
+    match = _SPAM_RE.search(url_lower)
+    if match:
+        return False, f"Spam site: {match.group(0)}"
     
     # Check news sites
-    for news in _NEWS_SITES:
-        if news in url_lower:
-            return False, f"News site: {news}"
+    match = _NEWS_RE.search(url_lower)
+    if match:
+        return False, f"News site: {match.group(0)}"
     
     # Check for date pattern in URL (news articles)
-    if re.search(r'/\d{4}/\d{2}/\d{2}/', url):
-        # Whitelist legitimate event domains
-        whitelist = ['facebook.com', 'instagram.com', 'gov.ua', 'irf.ua', 'rada.gov.ua']
-        if not any(w in url_lower for w in whitelist):
-            return False, "News article URL (date pattern)"
+    if _DATE_PATH_RE.search(url) and not _DATE_PATH_WHITELIST_RE.search(url_lower):
+        return False, "News article URL (date pattern)"
     
-    # Check listing patterns
-    for pattern in _LISTING_PATTERNS:
-        if pattern in url_lower:
-            # Allow if has event ID
-            if 'eventdetail' in url_lower or 'eventid' in url_lower:
-                continue
-            return False, f"Listing page: {pattern}"
+    # Check listing patterns (allowed if the URL has an event ID)
+    match = _LISTING_RE.search(url_lower)
+    if match and 'eventdetail' not in url_lower and 'eventid' not in url_lower:
+        return False, f"Listing page: {match.group(0)}"
     
     return True, "OK"
 
 
+# Attempts per PostgREST request; waits are full-jitter exponential, capped
+_MAX_ATTEMPTS = 5
+_BACKOFF_BASE = 0.5
+_BACKOFF_MAX = 16.0
+# PostgREST reports the HTTP status as the error code when the body isn't PostgREST JSON
+_TRANSIENT_CODES = {"429", "500", "502", "503", "504"}
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed request is worth retrying (rate limit, gateway or network error)."""
+    if isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, APIError) and str(error.code) in _TRANSIENT_CODES
+
+def _execute(query):
+    """Execute a PostgREST query, retrying transient failures with exponential backoff."""
+    for attempt in range(_MAX_ATTEMPTS):
+        try:
+            return query.execute()
+        except Exception as e:
+            if attempt == _MAX_ATTEMPTS - 1 or not _is_transient(e):
+                raise
+            delay = random.uniform(0, min(_BACKOFF_MAX, _BACKOFF_BASE * 2 ** attempt))
+            print(f"  ⚠️ Database request failed ({str(e)[:50]}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+
 class DatabaseClient:
     """Client for interacting with Supabase database."""
     
@@ -177,30 +305,31 @@ class DatabaseClient:
     
     def _force_translate(self, event_data: dict) -> dict:
         """MANDATORY translation of all Ukrainian text before saving."""
-        # Translate title
-        if _is_ukrainian(event_data.get('event_title', '')):
-            event_data['event_title'] = _translate_text(event_data['event_title'], "event title")
-        
-        # Translate organizer
-        if _is_ukrainian(event_data.get('organizer', '')):
-            event_data['organizer'] = _translate_text(event_data['organizer'], "organization name")
-        
-        # Translate summary
-        if _is_ukrainian(event_data.get('summary', '')):
-            event_data['summary'] = _translate_text(event_data['summary'], "event description")
+        # Title, organizer and summary go out together in one request per event
+        fields = {
+            name: (event_data[name], context)
+            for name, context in (
+                ("event_title", "event title"),
+                ("organizer", "organization name"),
+                ("summary", "event description"),
+            )
+            if _is_ukrainian(event_data.get(name, ''))
+        }
+        # English-only events (the common case) never reach the OpenAI code
+        if fields:
+            event_data.update(_translate_fields(fields))
         
         return event_data
     
-    def upsert_event(self, event_data: dict) -> dict:
+    def _prepare_event(self, event_data: dict) -> Optional[dict]:
         """
-        Insert or update an event based on URL (unique identifier).
-        ALWAYS validates URL and translates Ukrainian content before saving.
+        Run the mandatory pre-save checks and translation on one event.
         
         Args:
             event_data: Dictionary containing event fields
             
         Returns:
-            The inserted/updated event record, or None if URL is invalid
+            The (translated) event data, or None if the event must not be saved
         """
         # MANDATORY: Validate URL before saving
         url = event_data.get('url', '')
@@ -222,28 +351,134 @@ class DatabaseClient:
             return None
         
         # MANDATORY: Translate before saving
-        event_data = self._force_translate(event_data)
-        
-        # Check if event with this URL already exists
-        existing = self.client.table(self.table_name)\
-            .select("id, url")\
-            .eq("url", event_data["url"])\
-            .execute()
-        
-        if existing.data:
-            # Update existing event
-            event_id = existing.data[0]["id"]
-            result = self.client.table(self.table_name)\
-                .update(event_data)\
-                .eq("id", event_id)\
-                .execute()
-            return result.data[0] if result.data else None
-        else:
-            # Insert new event
-            result = self.client.table(self.table_name)\
-                .insert(event_data)\
-                .execute()
-            return result.data[0] if result.data else None
+        return self._force_translate(event_data)
+    
+    def upsert_event(self, event_data: dict) -> dict:
+        """
+        Insert or update an event based on URL (unique identifier).
+        ALWAYS validates URL and translates Ukrainian content before saving.
+        
+        Args:
+            event_data: Dictionary containing event fields
+            
+        Returns:
+            The inserted/updated event record, or None if URL is invalid
+        """
+        event_data = self._prepare_event(event_data)
+        if event_data is None:
+            return None
+        
+        # One INSERT ... ON CONFLICT (url) DO UPDATE round-trip (url is UNIQUE in schema.sql)
+        query = self.client.table(self.table_name)\
+            .upsert(event_data, on_conflict="url")
+        result = _execute(query)
+        return result.data[0] if result.data else None
+    
+    def _prepare_bulk_rows(self, events: List[dict]) -> Dict[Tuple[str, ...], List[dict]]:
+        """Prepare events for a bulk upsert, grouped by their (sorted) column names."""
+        # A single ON CONFLICT statement can't update the same row twice, so the
+        # last event per URL wins, as it would with sequential upsert_event calls
+        rows_by_url = {}
+        for event_data in events:
+            event_data = self._prepare_event(event_data)
+            if event_data is not None:
+                rows_by_url[event_data["url"]] = event_data
+        
+        # Bulk rows must share their columns; group so no row gets another's
+        # missing columns written as NULL
+        groups = {}
+        for row in rows_by_url.values():
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        return groups
+    
+    def upsert_events(self, events: List[dict], errors: Optional[List[str]] = None) -> List[dict]:
+        """
+        Insert or update many events with bulk upserts on URL.
+        Applies the same validation and translation as upsert_event to every event.
+        If a batch fails, its already-prepared rows are retried one at a time.
+        
+        Args:
+            events: List of event field dictionaries
+            errors: Optional list that collects a message per event that couldn't be saved
+            
+        Returns:
+            The inserted/updated event records (rejected and failed events are skipped)
+        """
+        saved = []
+        for rows in self._prepare_bulk_rows(events).values():
+            for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+                batch = rows[i:i + UPSERT_BATCH_SIZE]
+                try:
+                    query = self.client.table(self.table_name)\
+                        .upsert(batch, on_conflict="url")
+                    result = _execute(query)
+                    saved.extend(result.data or [])
+                    continue
+                except Exception as e:
+                    print(f"  ⚠️ Bulk upsert failed, saving {len(batch)} events individually: {str(e)[:80]}")
+                
+                # One bad row fails the whole batch; the others can still be saved
+                for row in batch:
+                    try:
+                        query = self.client.table(self.table_name)\
+                            .upsert(row, on_conflict="url")
+                        result = _execute(query)
+                        saved.extend(result.data or [])
+                    except Exception as e:
+                        error_msg = f"Error saving event '{row.get('event_title', 'Unknown')}': {str(e)}"
+                        print(f"  ❌ {error_msg}")
+                        if errors is not None:
+                            errors.append(error_msg)
+        return saved
+    
+    def bulk_upsert_events(self, events: List[dict], page_size: int = 500) -> int:
+        """
+        Insert or update many events over a direct Postgres connection.
+        For large backfills, where PostgREST's per-request overhead dominates;
+        requires psycopg2 and SUPABASE_DB_DSN or SUPABASE_DB_PASSWORD. Applies the same validation
+        and translation as upsert_event.
+        
+        Args:
+            events: List of event field dictionaries
+            page_size: Rows per multi-row INSERT statement
+            
+        Returns:
+            Number of events inserted or updated
+        """
+        from psycopg2 import sql
+        from psycopg2.extras import execute_values
+        from database.run_migration import connect_postgres
+        
+        db_password = os.getenv("SUPABASE_DB_PASSWORD")
+        if not db_password and not os.getenv("SUPABASE_DB_DSN"):
+            raise ValueError("SUPABASE_DB_DSN or SUPABASE_DB_PASSWORD must be set for direct database access")
+        
+        groups = self._prepare_bulk_rows(events)
+        conn = connect_postgres(os.getenv("SUPABASE_URL"), db_password)
+        try:
+            # One transaction for the whole load: it all lands or none of it does
+            with conn, conn.cursor() as cur:
+                saved = 0
+                for columns, rows in groups.items():
+                    statement = sql.SQL(
+                        "INSERT INTO {table} ({columns}) VALUES %s "
+                        "ON CONFLICT (url) DO UPDATE SET {updates}"
+                    ).format(
+                        table=sql.Identifier(self.table_name),
+                        columns=sql.SQL(", ").join(map(sql.Identifier, columns)),
+                        updates=sql.SQL(", ").join(
+                            sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c)) for c in columns
+                        )
+                    ).as_string(cur)
+                    execute_values(
+                        cur, statement,
+                        [tuple(row[c] for c in columns) for row in rows],
+                        page_size=page_size
+                    )
+                    saved += len(rows)
+            return saved
+        finally:
+            conn.close()
     
     def get_events(self, limit: int = 100, category: Optional[str] = None) -> List[dict]:
         """
@@ -264,7 +499,7 @@ class DatabaseClient:
         if category:
             query = query.eq("category", category)
         
-        result = query.execute()
+        result = _execute(query)
         return result.data if result.data else []
     
     def get_all_events(self, limit: int = 2000) -> List[dict]:
@@ -282,9 +517,38 @@ class DatabaseClient:
             .order("event_date", desc=False)\
             .limit(limit)
         
-        result = query.execute()
+        result = _execute(query)
         return result.data if result.data else []
     
+    def iter_all_events(self, page_size: int = 200, limit: Optional[int] = None) -> Iterator[dict]:
+        """
+        Stream all events (including past events) one page at a time.
+        
+        Args:
+            page_size: Rows fetched per request
+            limit: Optional maximum number of events to yield
+            
+        Yields:
+            Event records in event_date order
+        """
+        offset = 0
+        while limit is None or offset < limit:
+            end = offset + page_size - 1
+            if limit is not None:
+                end = min(end, limit - 1)
+            # Tie-break on id so pages don't overlap or skip rows sharing a date
+            query = self.client.table(self.table_name)\
+                .select("*")\
+                .order("event_date", desc=False)\
+                .order("id", desc=False)\
+                .range(offset, end)
+            result = _execute(query)
+            rows = result.data or []
+            yield from rows
+            if len(rows) < end - offset + 1:
+                break
+            offset = end + 1
+    
     def get_upcoming_events(self, days: int = 180) -> List[dict]:  # Default: 6 months
         """
         Get events in the next N days.
@@ -295,16 +559,15 @@ class DatabaseClient:
         Returns:
             List of upcoming event records
         """
-        from datetime import date, timedelta
         today = date.today()
         future_date = today + timedelta(days=days)
         
-        result = self.client.table(self.table_name)\
+        query = self.client.table(self.table_name)\
             .select("*")\
             .gte("event_date", today.isoformat())\
             .lte("event_date", future_date.isoformat())\
-            .order("event_date", desc=False)\
-            .execute()
+            .order("event_date", desc=False)
+        result = _execute(query)
         
         return result.data if result.data else []
     
@@ -316,16 +579,36 @@ class DatabaseClient:
             limit: Maximum number of events to return
         
         Returns:
-            List of event records with title and date
+            List of event records with title, date and URL
         """
-        result = self.client.table(self.table_name)\
-            .select("event_title, event_date")\
+        query = self.client.table(self.table_name)\
+            .select("event_title, event_date, url")\
             .order("event_date", desc=False)\
-            .limit(limit)\
-            .execute()
+            .limit(limit)
+        result = _execute(query)
         
         return result.data if result.data else []
     
+    def check_existing_urls(self, urls: List[str]) -> Set[str]:
+        """
+        Find which of the given URLs are already stored.
+        
+        Args:
+            urls: Candidate event URLs
+        
+        Returns:
+            The subset of urls that have an event in the database
+        """
+        urls = list(dict.fromkeys(u for u in urls if u))
+        existing = set()
+        for i in range(0, len(urls), URL_BATCH_SIZE):
+            query = self.client.table(self.table_name)\
+                .select("url")\
+                .in_("url", urls[i:i + URL_BATCH_SIZE])
+            result = _execute(query)
+            existing.update(row["url"] for row in result.data or [])
+        return existing
+    
     def delete_event(self, event_id: int) -> bool:
         """
         Delete an event by its ID.
@@ -337,10 +620,10 @@ class DatabaseClient:
             True if deleted, False otherwise
         """
         try:
-            self.client.table(self.table_name)\
+            query = self.client.table(self.table_name)\
                 .delete()\
-                .eq("id", event_id)\
-                .execute()
+                .eq("id", event_id)
+            _execute(query)
             return True
         except Exception as e:
             print(f"Error deleting event: {e}")
@@ -357,10 +640,10 @@ class DatabaseClient:
             True if deleted, False otherwise
         """
         try:
-            result = self.client.table(self.table_name)\
+            query = self.client.table(self.table_name)\
                 .delete()\
-                .eq("url", url)\
-                .execute()
+                .eq("url", url)
+            result = _execute(query)
             return True
         except Exception as e:
             print(f"Error deleting event: {e}")
@@ -377,8 +660,25 @@ class DatabaseClient:
             Number of events deleted
         """
         deleted = 0
-        for url in urls:
-            if self.delete_event_by_url(url):
-                deleted += 1
+        for i in range(0, len(urls), URL_BATCH_SIZE):
+            batch = urls[i:i + URL_BATCH_SIZE]
+            try:
+                query = self.client.table(self.table_name)\
+                    .delete()\
+                    .in_("url", batch)
+                result = _execute(query)
+                deleted += len(result.data or [])
+            except Exception as e:
+                print(f"Error deleting {len(batch)} events: {e}")
         return deleted
 
+
+@functools.lru_cache(maxsize=1)
+def get_db() -> DatabaseClient:
+    """
+    Shared DatabaseClient for the process.
+    
+    Each DatabaseClient builds its own supabase client and HTTP connection pool,
+    so code that needs database access should use this instead of constructing one.
+    """
+    return DatabaseClient()
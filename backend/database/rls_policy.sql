@@ -6,11 +6,23 @@ ALTER TABLE events ENABLE ROW LEVEL SECURITY;
 
 -- Policy: Allow public read access to events
 -- This allows the frontend (using anon key) to read events
-CREATE POLICY "Allow public read access to events"
-ON events
-FOR SELECT
-TO anon, authenticated
-USING (true);
+-- (created only if missing, so re-running this file is idempotent)
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_policies
+        WHERE schemaname = 'public'
+          AND tablename = 'events'
+          AND policyname = 'Allow public read access to events'
+    ) THEN
+        CREATE POLICY "Allow public read access to events"
+        ON events
+        FOR SELECT
+        TO anon, authenticated
+        USING (true);
+    END IF;
+END
+$$;
 
 -- Note: INSERT and UPDATE operations are restricted to service role only
 -- This is the default behavior - only the backend (with service role key) can write
@@ -8,6 +8,65 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+
+def connect_postgres(supabase_url: str, db_password: str):
+    """
+    Open a direct psycopg2 connection to a Supabase project's Postgres database.
+    
+    If SUPABASE_DB_DSN is set (e.g. the Session Pooler connection string from
+    Supabase Dashboard → Connect), it is used as-is. Otherwise tries the
+    connection pooler first, then the direct database host.
+    
+    Args:
+        supabase_url: Project URL (https://[project-ref].supabase.co)
+        db_password: Database password (Supabase Dashboard → Settings → Database)
+    
+    Returns:
+        An open psycopg2 connection
+    """
+    import psycopg2
+    from urllib.parse import urlparse
+    
+    dsn = os.getenv("SUPABASE_DB_DSN")
+    if dsn:
+        return psycopg2.connect(dsn, connect_timeout=10)
+    
+    # Extract host from SUPABASE_URL
+    # Format: https://[project-ref].supabase.co
+    parsed_url = urlparse(supabase_url)
+    host = parsed_url.hostname
+    # Extract project ref (e.g., qjuaqnhwpwmywgshghpq from qjuaqnhwpwmywgshghpq.supabase.co)
+    project_ref = host.split('.')[0]
+    
+    # Try connection pooler first (more reliable)
+    # Format: [project-ref].pooler.supabase.com
+    db_hosts = [
+        f"{project_ref}.pooler.supabase.com",  # Connection pooler
+        f"db.{project_ref}.supabase.co",       # Direct connection
+    ]
+    
+    # Try each host until one works
+    last_error = None
+    for db_host in db_hosts:
+        try:
+            print(f"🔗 Trying connection to {db_host}...")
+            conn = psycopg2.connect(
+                host=db_host,
+                port=5432,
+                database="postgres",
+                user="postgres",
+                password=db_password,
+                connect_timeout=10
+            )
+            print(f"✅ Connected to {db_host}!")
+            return conn
+        except Exception as e:
+            last_error = e
+            print(f"   ⚠️  {db_host} failed: {str(e)[:100]}")
+    
+    raise Exception(f"Could not connect to any database host. Last error: {last_error}")
+
+
 def run_migration():
     """Execute the database migration SQL."""
     supabase_url = os.getenv("SUPABASE_URL")
@@ -32,6 +91,9 @@ def run_migration():
 
     -- Add index on registration_url for faster lookups
     CREATE INDEX IF NOT EXISTS idx_events_registration_url ON events(registration_url) WHERE registration_url IS NOT NULL;
+
+    -- Add index matching the (event_date, id) ordering used by paginated event reads
+    CREATE INDEX IF NOT EXISTS idx_events_date_id ON events(event_date, id);
     """
     
     print("📝 Running migration SQL...")
@@ -53,7 +115,8 @@ def run_migration():
         # Split SQL into individual statements
         statements = [
             "ALTER TABLE events ADD COLUMN IF NOT EXISTS event_time TIME, ADD COLUMN IF NOT EXISTS target_audience TEXT, ADD COLUMN IF NOT EXISTS registration_url TEXT;",
-            "CREATE INDEX IF NOT EXISTS idx_events_registration_url ON events(registration_url) WHERE registration_url IS NOT NULL;"
+            "CREATE INDEX IF NOT EXISTS idx_events_registration_url ON events(registration_url) WHERE registration_url IS NOT NULL;",
+            "CREATE INDEX IF NOT EXISTS idx_events_date_id ON events(event_date, id);"
         ]
         
         # Use Supabase REST API to execute SQL
@@ -67,11 +130,6 @@ def run_migration():
         # Try using psycopg2 for direct PostgreSQL connection
         try:
             import psycopg2
-            from urllib.parse import urlparse
-            
-            # Parse Supabase URL to get connection details
-            # Supabase connection string format: postgresql://postgres:[password]@[host]:[port]/postgres
-            # We need to construct this from the database password
             
             # Try to get database password from environment or use the one provided earlier
             db_password = os.getenv("SUPABASE_DB_PASSWORD") or "u8asfMxdtsqKpXfQ"
@@ -81,47 +139,7 @@ def run_migration():
                 print("   You can find it in: Supabase Dashboard → Settings → Database")
                 sys.exit(1)
             
-            # Extract host from SUPABASE_URL
-            # Format: https://[project-ref].supabase.co
-            parsed_url = urlparse(supabase_url)
-            host = parsed_url.hostname
-            # Extract project ref (e.g., qjuaqnhwpwmywgshghpq from qjuaqnhwpwmywgshghpq.supabase.co)
-            project_ref = host.split('.')[0]
-            
-            # Try connection pooler first (more reliable)
-            # Format: [project-ref].pooler.supabase.com
-            db_hosts = [
-                f"{project_ref}.pooler.supabase.com",  # Connection pooler
-                f"db.{project_ref}.supabase.co",       # Direct connection
-            ]
-            db_port = 5432
-            db_name = "postgres"
-            db_user = "postgres"
-            
-            # Try each host until one works
-            conn = None
-            last_error = None
-            for db_host in db_hosts:
-                try:
-                    print(f"🔗 Trying connection to {db_host}...")
-                    conn = psycopg2.connect(
-                        host=db_host,
-                        port=db_port,
-                        database=db_name,
-                        user=db_user,
-                        password=db_password,
-                        connect_timeout=10
-                    )
-                    print(f"✅ Connected to {db_host}!")
-                    break
-                except Exception as e:
-                    last_error = e
-                    print(f"   ⚠️  {db_host} failed: {str(e)[:100]}")
-                    continue
-            
-            if not conn:
-                raise Exception(f"Could not connect to any database host. Last error: {last_error}")
-            
+            conn = connect_postgres(supabase_url, db_password)
             conn.autocommit = True
             cursor = conn.cursor()
             
@@ -140,22 +158,10 @@ def run_migration():
                     else:
                         print(f"   ⚠️  Statement {i} warning: {str(e)}")
             
-            cursor.close()
-            conn.close()
-            
             print("\n✅ Migration completed successfully!")
             print("\n📊 Verifying migration...")
             
-            # Verify by checking columns
-            conn = psycopg2.connect(
-                host=db_host,
-                port=db_port,
-                database=db_name,
-                user=db_user,
-                password=db_password
-            )
-            cursor = conn.cursor()
-            
+            # Verify by checking columns (same autocommit connection, no second handshake)
             cursor.execute("""
                 SELECT column_name, data_type, is_nullable
                 FROM information_schema.columns
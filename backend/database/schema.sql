@@ -30,6 +30,8 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
+-- Drop first so re-running this file is idempotent
+DROP TRIGGER IF EXISTS update_events_updated_at ON events;
 CREATE TRIGGER update_events_updated_at BEFORE UPDATE ON events
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
@@ -10,6 +10,9 @@ ADD COLUMN IF NOT EXISTS registration_url TEXT;
 -- Add index on registration_url for faster lookups
 CREATE INDEX IF NOT EXISTS idx_events_registration_url ON events(registration_url) WHERE registration_url IS NOT NULL;
 
+-- Add index matching the (event_date, id) ordering used by paginated event reads
+CREATE INDEX IF NOT EXISTS idx_events_date_id ON events(event_date, id);
+
 -- Add comment for documentation
 COMMENT ON COLUMN events.event_time IS 'Time of the event (HH:MM format)';
 COMMENT ON COLUMN events.target_audience IS 'Target audience (e.g., Donors, Government Officials, Architects)';
@@ -5,12 +5,29 @@ from datetime import date
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.models import Event
+from agent.keywords import keyword_matcher
+
+
+# Keyword lists for each issue check, compiled once at import
+_PROGRAM_RE = keyword_matcher([
+    "compensation program", "housing program", "program for",
+    "applications open", "can submit", "submitting applications",
+    "program starts", "launch of", "housing vouchers"
+])
+_APPLICATION_RE = keyword_matcher(["can submit applications", "applications open", "apply for"])
+_SUMMARY_EVENT_RE = keyword_matcher(["conference", "workshop", "seminar", "webinar", "forum", "event"])
+_GENERIC_PAGE_RE = keyword_matcher(["/contact", "/about", "/home"])
+_EVENT_PAGE_RE = keyword_matcher(["eventdetail", "/event/", "/events/"])
+_HOLIDAY_RE = keyword_matcher(["day of", "день", "national day", "professional holiday"])
+_TITLE_EVENT_RE = keyword_matcher(["conference", "workshop", "seminar", "webinar", "forum", "meeting", "event"])
+_NEWS_PATH_RE = keyword_matcher(["/news/", "/article/", "/blog/"])
+
 
 def check_event_issues():
     """Check all events for known issues."""
-    db_client = DatabaseClient()
+    db_client = get_db()
     events_data = db_client.get_all_events(limit=2000)
     events = [Event(**e) for e in events_data]
     
@@ -34,13 +51,7 @@ def check_event_issues():
         url_lower = event.url.lower()
         
         # 1. Check for program announcements
-        program_keywords = [
-            "compensation program", "housing program", "program for",
-            "applications open", "can submit", "submitting applications",
-            "program starts", "launch of", "housing vouchers"
-        ]
-        
-        if any(kw in title_lower for kw in program_keywords):
+        if _PROGRAM_RE.search(title_lower):
             issues_found["program_announcements"].append({
                 "title": event.event_title,
                 "date": event.event_date,
@@ -48,8 +59,8 @@ def check_event_issues():
                 "reason": "Title contains program announcement keywords"
             })
         
-        if any(kw in summary_lower for kw in ["can submit applications", "applications open", "apply for"]):
-            if not any(ev in summary_lower for ev in ["conference", "workshop", "seminar", "webinar", "forum", "event"]):
+        if _APPLICATION_RE.search(summary_lower):
+            if not _SUMMARY_EVENT_RE.search(summary_lower):
                 issues_found["program_announcements"].append({
                     "title": event.event_title,
                     "date": event.event_date,
@@ -58,13 +69,7 @@ def check_event_issues():
                 })
         
         # 2. Check for wrong URLs (aggregator/generic pages)
-        generic_pages = ["/contact", "/about", "/home"]
-        event_page_indicators = ["eventdetail", "/event/", "/events/"]
-        
-        has_generic = any(page in url_lower for page in generic_pages)
-        has_event_page = any(ind in url_lower for ind in event_page_indicators)
-        
-        if has_generic and not has_event_page:
+        if _GENERIC_PAGE_RE.search(url_lower) and not _EVENT_PAGE_RE.search(url_lower):
             issues_found["wrong_urls"].append({
                 "title": event.event_title,
                 "date": event.event_date,
@@ -73,11 +78,8 @@ def check_event_issues():
             })
         
         # 3. Check for holidays/observances
-        holiday_keywords = ["day of", "день", "national day", "professional holiday"]
-        event_keywords = ["conference", "workshop", "seminar", "webinar", "forum", "meeting", "event"]
-        
-        if any(hk in title_lower for hk in holiday_keywords):
-            if not any(ek in title_lower for ek in event_keywords):
+        if _HOLIDAY_RE.search(title_lower):
+            if not _TITLE_EVENT_RE.search(title_lower):
                 issues_found["holidays_observances"].append({
                     "title": event.event_title,
                     "date": event.event_date,
@@ -86,8 +88,7 @@ def check_event_issues():
                 })
         
         # 4. Check for news articles
-        news_keywords = ["/news/", "/article/", "/blog/"]
-        if any(nk in url_lower for nk in news_keywords):
+        if _NEWS_PATH_RE.search(url_lower):
             issues_found["news_articles"].append({
                 "title": event.event_title,
                 "date": event.event_date,
@@ -96,23 +97,18 @@ def check_event_issues():
             })
     
     # 5. Check for duplicates
-    seen_titles = {}
+    # First event seen for each normalized title; later ones are its duplicates
+    first_by_title = {}
     for event in events:
-        title_normalized = event.event_title.lower().strip()
-        if title_normalized in seen_titles:
+        first = first_by_title.setdefault(event.event_title.lower().strip(), event)
+        if first is not event:
             issues_found["duplicates"].append({
                 "title": event.event_title,
                 "date": event.event_date,
                 "url": event.url,
-                "duplicate_of": seen_titles[title_normalized]["title"],
-                "duplicate_url": seen_titles[title_normalized]["url"]
+                "duplicate_of": first.event_title,
+                "duplicate_url": first.url
             })
-        else:
-            seen_titles[title_normalized] = {
-                "title": event.event_title,
-                "url": event.url,
-                "date": event.event_date
-            }
     
     # Print results
     print("=" * 80)
@@ -170,4 +166,3 @@ if __name__ == "__main__":
     check_event_issues()
 
 
-
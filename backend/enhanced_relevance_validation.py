@@ -2,25 +2,50 @@
 import sys
 import os
 from datetime import date, timedelta
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import re
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.url_content_analyzer import URLContentAnalyzer
 from agent.date_validator import DateValidator
 from agent.url_follower import URLFollower
+from agent.url_validator import install_dns_cache
+
+# Events validated concurrently; stays below the shared session pool size.
+VALIDATION_WORKERS = 16
+# Bytes of HTML read per page for the title/h1/lead-text checks.
+PAGE_HEAD_BYTES = 8192
 
 class EnhancedRelevanceValidator:
     """Enhanced validator that checks title-content matching and relevance."""
     
     def __init__(self):
-        self.db_client = DatabaseClient()
+        self.db_client = get_db()
         self.url_analyzer = URLContentAnalyzer()
         self.date_validator = DateValidator()
         self.url_follower = URLFollower()
         
+        # One pooled keep-alive session for the validator's and analyzer's page
+        # fetches, so repeated hosts don't pay a new TCP/TLS handshake each time
+        self.session = requests.Session()
+        self.session.headers.update(self.url_analyzer.session.headers)
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.url_analyzer.session = self.session
+        # URLFollower crawls with its own per-thread pooled httpx client
+        
         # Urban planning and recovery related keywords (VERY EXPANDED - keep anything that could be related)
         self.urban_keywords = [
             'urban', 'city', 'cities', 'planning', 'spatial', 'municipal', 'local government',
@@ -51,15 +76,22 @@ class EnhancedRelevanceValidator:
             (matches: bool, reason: str)
         """
         try:
-            response = self.url_analyzer.session.get(url, timeout=10, allow_redirects=True)
-            if response.status_code != 200:
-                return True, "Could not check (HTTP error)"  # Don't reject on network errors
+            # Only the head of the page is inspected, so stop reading after it
+            with self.session.get(url, stream=True, timeout=(3, 10), allow_redirects=True) as response:
+                if response.status_code != 200:
+                    return True, "Could not check (HTTP error)"  # Don't reject on network errors
+                chunk = response.raw.read(PAGE_HEAD_BYTES, decode_content=True)
+                # Honour the declared charset (many Ukrainian sites still serve windows-1251);
+                # detect from the chunk itself, since apparent_encoding would read the whole body
+                encoding = response.encoding or chardet.detect(chunk)["encoding"] or "utf-8"
             
-            content = response.text.lower()
+            try:
+                content = chunk.decode(encoding, errors="replace").lower()
+            except LookupError:
+                content = chunk.decode("utf-8", errors="replace").lower()
             title_lower = title.lower()
             
             # Extract page title from HTML
-            import re
             page_title_match = re.search(r'<title[^>]*>([^<]+)</title>', content, re.IGNORECASE)
             page_title = page_title_match.group(1).lower() if page_title_match else ""
             
@@ -199,105 +231,30 @@ class EnhancedRelevanceValidator:
             "issues": []
         }
         
-        for event in events:
-            event_id = event.get("id")
-            title = event.get("event_title", "")
-            summary = event.get("summary", "")
-            event_url = event.get("url", "")
-            
-            print(f"Validating: {title[:60]}...")
-            
-            # Check 1: Title-Content Matching (VERY conservative - only remove CLEAR mismatches)
-            # Only check for eventdetail URLs (most reliable)
-            if 'eventdetail' in event_url.lower():
-                matches, match_reason = self.check_title_content_match(title, event_url)
-                if not matches:
-                    # ONLY remove if it's a CLEAR topic mismatch (urban vs language studies, education, etc.)
-                    title_lower = title.lower()
-                    if "urban" in title_lower or "city" in title_lower or "planning" in title_lower:
-                        # Title is about urban planning
-                        if ("spanish" in match_reason.lower() or "latin american" in match_reason.lower() or 
-                            "arabic" in match_reason.lower() or "islamic" in match_reason.lower() or 
-                            "teacher" in match_reason.lower() or "education" in match_reason.lower()):
-                            # Clear mismatch - remove
-                            print(f"  ❌ TITLE MISMATCH: {match_reason}")
-                            self._remove_event(event_id, f"Title mismatch: {match_reason}")
-                            stats["removed"] += 1
-                            stats["issues"].append({"event": title, "issue": f"Title mismatch: {match_reason}", "action": "removed"})
-                            continue
-                    # For other cases, keep the event (might be valid)
-                    print(f"  ⚠️  Title-Content match warning: {match_reason} (keeping - might be valid)")
-            else:
-                # For listing pages, try to find specific event (with increased depth)
-                print(f"  ⚠️  Listing page detected, trying to find specific event...")
-                # Use max_depth=3 for listing pages to go deeper
-                max_depth = 3 if any(ind in event_url.lower() for ind in ['/events', '/event-list', '/calendar']) else 2
-                better_url = self.url_follower.find_direct_event_url(event_url, title, max_depth=max_depth)
-                if better_url and better_url != event_url:
-                    # Verify the better URL matches the title
-                    matches_better, match_reason = self.check_title_content_match(title, better_url)
-                    if matches_better or 'eventdetail' in better_url.lower():
-                        print(f"  ✅ Found matching eventdetail URL: {better_url[:60]}...")
-                        self._update_event_url(event_id, better_url)
-                        stats["fixed"] += 1
-                        stats["issues"].append({"event": title, "issue": "URL improved to eventdetail", "action": "fixed"})
-                    else:
-                        print(f"  ⚠️  Better URL found but doesn't match title: {match_reason}")
-                        # Check if it's a topic mismatch
-                        if "doesn't match URL content topic" in match_reason:
-                            print(f"  ❌ Topic mismatch, removing event")
-                            self._remove_event(event_id, f"Topic mismatch: {match_reason}")
+        # The per-event checks are network-bound (page fetches and link
+        # crawling), so run them concurrently; database writes and output
+        # are then applied serially in the original event order.
+        try:
+            with ThreadPoolExecutor(max_workers=VALIDATION_WORKERS) as executor:
+                results = executor.map(self._validate_event, events)
+                for event, (lines, actions) in zip(events, results):
+                    for line in lines:
+                        print(line)
+                    if actions is None:
+                        continue  # Validation errored; leave the event untouched
+                    for action, value, issue in actions:
+                        if action == "remove":
+                            self._remove_event(event.get("id"), value)
                             stats["removed"] += 1
-                            stats["issues"].append({"event": title, "issue": f"Topic mismatch: {match_reason}", "action": "removed"})
-                            continue
-                else:
-                    print(f"  ⚠️  Could not find specific event URL")
-            
-            # Check 2: Relevance to Urban Planning (ULTRA conservative - keep almost everything)
-            is_relevant, relevance_reason = self.check_relevance(title, summary, event_url)
-            if not is_relevant:
-                # ONLY remove if it's VERY clearly about an irrelevant topic
-                # AND has NO urban/recovery keywords
-                # AND is not a forum/conference/workshop
-                # AND is not Ukraine/Europe related
-                title_lower = title.lower()
-                summary_lower = (summary or "").lower()
-                has_urban = any(kw in title_lower or kw in summary_lower for kw in self.urban_keywords)
-                is_event_type = any(et in title_lower for et in ['forum', 'conference', 'workshop', 'seminar', 'webinar', 'meeting', 'summit'])
-                is_location = any(loc in title_lower or loc in summary_lower for loc in ['ukraine', 'ukrainian', 'sumy', 'kyiv', 'lviv', 'kharkiv', 'odessa', 'europe'])
-                
-                # Only remove if it's clearly irrelevant AND no urban keywords AND not an event type AND not location-related
-                if not has_urban and not is_event_type and not is_location:
-                    print(f"  ❌ NOT RELEVANT: {relevance_reason}")
-                    self._remove_event(event_id, f"Not relevant: {relevance_reason}")
-                    stats["removed"] += 1
-                    stats["issues"].append({"event": title, "issue": f"Not relevant: {relevance_reason}", "action": "removed"})
-                    continue
-                else:
-                    # Keep it - might be relevant
-                    print(f"  ⚠️  {relevance_reason} (keeping - has urban keywords, event type, or location)")
-            else:
-                print(f"  ✅ {relevance_reason}")
-            
-            # Check 3: Try to improve URL if it's a listing page
-            if 'eventdetail' not in event_url.lower() and ('/events' in event_url.lower() or '/event-list' in event_url.lower() or '/calendar' in event_url.lower()):
-                print(f"  ⚠️  Listing page detected, trying to find specific event (crawling deeper)...")
-                # Use max_depth=3 for listing pages to go deeper and extract event details
-                better_url = self.url_follower.find_direct_event_url(event_url, title, max_depth=3)
-                if better_url and better_url != event_url:
-                    # Verify the better URL matches the title
-                    matches_better, _ = self.check_title_content_match(title, better_url)
-                    if matches_better:
-                        print(f"  ✅ Found matching eventdetail URL: {better_url[:60]}...")
-                        self._update_event_url(event_id, better_url)
-                        stats["fixed"] += 1
-                        stats["issues"].append({"event": title, "issue": "URL improved to eventdetail", "action": "fixed"})
-                    else:
-                        print(f"  ⚠️  Better URL found but doesn't match title, keeping original")
-                else:
-                    print(f"  ⚠️  Could not find specific event URL")
-            
-            print(f"  ✅ Valid event\n")
+                        else:
+                            self._update_event_url(event.get("id"), value)
+                            stats["fixed"] += 1
+                        stats["issues"].append(issue)
+                    if not any(action == "remove" for action, _, _ in actions):
+                        print(f"  ✅ Valid event\n")
+        finally:
+            # Release the follower's per-worker loops and HTTP connections
+            self.url_follower.close()
         
         print("=" * 80)
         print("VALIDATION SUMMARY")
@@ -315,6 +272,118 @@ class EnhancedRelevanceValidator:
         
         return stats
     
+    def _validate_event(self, event: Dict) -> Tuple[List[str], Optional[List[Tuple[str, str, Dict]]]]:
+        """Run the network-bound checks for a single event.
+
+        Args:
+            event: Event row from the database.
+
+        Returns:
+            Tuple of (log lines, actions) where each action is
+            ("remove", reason, issue) or ("update_url", new_url, issue).
+            actions is None if the checks raised. Nothing is written to
+            the database here.
+        """
+        log: List[str] = []
+        actions: List[Tuple[str, str, Dict]] = []
+        try:
+            return self._check_event(event, log, actions)
+        except Exception as e:
+            # One bad event shouldn't stop the batch; skip it without any DB changes
+            log.append(f"  ⚠️  Error validating event, skipping: {e}\n")
+            return log, None
+    
+    def _check_event(self, event: Dict, log: List[str],
+                     actions: List[Tuple[str, str, Dict]]) -> Tuple[List[str], List[Tuple[str, str, Dict]]]:
+        """Body of _validate_event; appends to log and actions as checks run."""
+        title = event.get("event_title", "")
+        summary = event.get("summary", "")
+        event_url = event.get("url", "")
+
+        log.append(f"Validating: {title[:60]}...")
+
+        # Check 1: Title-Content Matching (VERY conservative - only remove CLEAR mismatches)
+        # Only check for eventdetail URLs (most reliable)
+        if 'eventdetail' in event_url.lower():
+            matches, match_reason = self.check_title_content_match(title, event_url)
+            if not matches:
+                # ONLY remove if it's a CLEAR topic mismatch (urban vs language studies, education, etc.)
+                title_lower = title.lower()
+                if "urban" in title_lower or "city" in title_lower or "planning" in title_lower:
+                    # Title is about urban planning
+                    if ("spanish" in match_reason.lower() or "latin american" in match_reason.lower() or 
+                        "arabic" in match_reason.lower() or "islamic" in match_reason.lower() or 
+                        "teacher" in match_reason.lower() or "education" in match_reason.lower()):
+                        # Clear mismatch - remove
+                        log.append(f"  ❌ TITLE MISMATCH: {match_reason}")
+                        actions.append(("remove", f"Title mismatch: {match_reason}", {"event": title, "issue": f"Title mismatch: {match_reason}", "action": "removed"}))
+                        return log, actions
+                # For other cases, keep the event (might be valid)
+                log.append(f"  ⚠️  Title-Content match warning: {match_reason} (keeping - might be valid)")
+        else:
+            # For listing pages, try to find specific event (with increased depth)
+            log.append(f"  ⚠️  Listing page detected, trying to find specific event...")
+            # Use max_depth=3 for listing pages to go deeper
+            max_depth = 3 if any(ind in event_url.lower() for ind in ['/events', '/event-list', '/calendar']) else 2
+            better_url = self.url_follower.find_direct_event_url(event_url, title, max_depth=max_depth)
+            if better_url and better_url != event_url:
+                # Verify the better URL matches the title
+                matches_better, match_reason = self.check_title_content_match(title, better_url)
+                if matches_better or 'eventdetail' in better_url.lower():
+                    log.append(f"  ✅ Found matching eventdetail URL: {better_url[:60]}...")
+                    actions.append(("update_url", better_url, {"event": title, "issue": "URL improved to eventdetail", "action": "fixed"}))
+                else:
+                    log.append(f"  ⚠️  Better URL found but doesn't match title: {match_reason}")
+                    # Check if it's a topic mismatch
+                    if "doesn't match URL content topic" in match_reason:
+                        log.append(f"  ❌ Topic mismatch, removing event")
+                        actions.append(("remove", f"Topic mismatch: {match_reason}", {"event": title, "issue": f"Topic mismatch: {match_reason}", "action": "removed"}))
+                        return log, actions
+            else:
+                log.append(f"  ⚠️  Could not find specific event URL")
+
+        # Check 2: Relevance to Urban Planning (ULTRA conservative - keep almost everything)
+        is_relevant, relevance_reason = self.check_relevance(title, summary, event_url)
+        if not is_relevant:
+            # ONLY remove if it's VERY clearly about an irrelevant topic
+            # AND has NO urban/recovery keywords
+            # AND is not a forum/conference/workshop
+            # AND is not Ukraine/Europe related
+            title_lower = title.lower()
+            summary_lower = (summary or "").lower()
+            has_urban = any(kw in title_lower or kw in summary_lower for kw in self.urban_keywords)
+            is_event_type = any(et in title_lower for et in ['forum', 'conference', 'workshop', 'seminar', 'webinar', 'meeting', 'summit'])
+            is_location = any(loc in title_lower or loc in summary_lower for loc in ['ukraine', 'ukrainian', 'sumy', 'kyiv', 'lviv', 'kharkiv', 'odessa', 'europe'])
+
+            # Only remove if it's clearly irrelevant AND no urban keywords AND not an event type AND not location-related
+            if not has_urban and not is_event_type and not is_location:
+                log.append(f"  ❌ NOT RELEVANT: {relevance_reason}")
+                actions.append(("remove", f"Not relevant: {relevance_reason}", {"event": title, "issue": f"Not relevant: {relevance_reason}", "action": "removed"}))
+                return log, actions
+            else:
+                # Keep it - might be relevant
+                log.append(f"  ⚠️  {relevance_reason} (keeping - has urban keywords, event type, or location)")
+        else:
+            log.append(f"  ✅ {relevance_reason}")
+
+        # Check 3: Try to improve URL if it's a listing page
+        if 'eventdetail' not in event_url.lower() and ('/events' in event_url.lower() or '/event-list' in event_url.lower() or '/calendar' in event_url.lower()):
+            log.append(f"  ⚠️  Listing page detected, trying to find specific event (crawling deeper)...")
+            # Use max_depth=3 for listing pages to go deeper and extract event details
+            better_url = self.url_follower.find_direct_event_url(event_url, title, max_depth=3)
+            if better_url and better_url != event_url:
+                # Verify the better URL matches the title
+                matches_better, _ = self.check_title_content_match(title, better_url)
+                if matches_better:
+                    log.append(f"  ✅ Found matching eventdetail URL: {better_url[:60]}...")
+                    actions.append(("update_url", better_url, {"event": title, "issue": "URL improved to eventdetail", "action": "fixed"}))
+                else:
+                    log.append(f"  ⚠️  Better URL found but doesn't match title, keeping original")
+            else:
+                log.append(f"  ⚠️  Could not find specific event URL")
+
+        return log, actions
+    
     def _remove_event(self, event_id: str, reason: str):
         """Remove an event from the database."""
         try:
@@ -332,6 +401,7 @@ class EnhancedRelevanceValidator:
             print(f"    Error updating URL: {e}")
 
 if __name__ == "__main__":
+    install_dns_cache()  # Crawling revisits the same event sites
     validator = EnhancedRelevanceValidator()
     validator.validate_and_fix_all_events()
 
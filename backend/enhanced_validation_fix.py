@@ -6,7 +6,7 @@ from typing import List, Dict, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.url_content_analyzer import URLContentAnalyzer
 from agent.date_validator import DateValidator
 from agent.url_follower import URLFollower
@@ -16,7 +16,7 @@ class EnhancedValidator:
     """Enhanced validator with automatic fixing capabilities."""
     
     def __init__(self):
-        self.db_client = DatabaseClient()
+        self.db_client = get_db()
         self.url_analyzer = URLContentAnalyzer()
         self.date_validator = DateValidator()
         self.url_follower = URLFollower()
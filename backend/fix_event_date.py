@@ -5,7 +5,7 @@ from datetime import date
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.url_content_analyzer import URLContentAnalyzer
 
 def fix_event_date():
@@ -15,7 +15,7 @@ def fix_event_date():
     print("=" * 60)
     print()
     
-    db_client = DatabaseClient()
+    db_client = get_db()
     url_analyzer = URLContentAnalyzer()
     
     # Get the event
@@ -5,11 +5,11 @@ from datetime import date
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 
 def fix_remaining_issues():
     """Fix remaining specific issues."""
-    db_client = DatabaseClient()
+    db_client = get_db()
     
     print("=" * 80)
     print("FIXING REMAINING ISSUES")
@@ -5,7 +5,7 @@ from datetime import date
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.url_content_analyzer import URLContentAnalyzer
 from agent.date_validator import DateValidator
 
@@ -16,7 +16,7 @@ def fix_specific_issues():
     print("=" * 80)
     print()
     
-    db_client = DatabaseClient()
+    db_client = get_db()
     url_analyzer = URLContentAnalyzer()
     date_validator = DateValidator()
     
@@ -4,7 +4,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.url_follower import URLFollower
 
 def fix_specific_urls():
@@ -14,7 +14,7 @@ def fix_specific_urls():
     print("=" * 80)
     print()
     
-    db = DatabaseClient()
+    db = get_db()
     url_follower = URLFollower()
     
     events = db.get_events(limit=1000)
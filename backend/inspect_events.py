@@ -5,7 +5,7 @@ from collections import Counter
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 
 
 def inspect_events():
@@ -16,7 +16,7 @@ def inspect_events():
     print()
     
     try:
-        db_client = DatabaseClient()
+        db_client = get_db()
         all_events = db_client.get_events(limit=1000)
         
         print(f"Total events: {len(all_events)}")
@@ -4,12 +4,12 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.models import Event
 
 def remove_invalid_events():
     """Remove events that are programs, holidays, news, or duplicates."""
-    db_client = DatabaseClient()
+    db_client = get_db()
     events_data = db_client.get_all_events(limit=2000)
     events = [Event(**e) for e in events_data]
     
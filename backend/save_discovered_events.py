@@ -9,7 +9,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 load_dotenv()
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.models import Event, EventCategory
 
 # The 22 events that were discovered (from the research agent output)
@@ -222,7 +222,7 @@ def main():
     print()
     
     try:
-        db_client = DatabaseClient()
+        db_client = get_db()
         print(f"✅ Connected to database")
         print()
         
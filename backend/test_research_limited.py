@@ -33,11 +33,12 @@ def test_research():
     for i, query in enumerate(test_queries, 1):
         print(f"[{datetime.now()}] Query {i}/{len(test_queries)}: {query[:50]}...")
         try:
-            results = search_agent.search(query, max_results=5)  # Limit to 5 results per query
+            results = search_agent.search(query, max_results=5, include_raw=True)  # Limit to 5 results per query
             all_results.extend(results)
             print(f"  ✅ Found {len(results)} results")
         except Exception as e:
             print(f"  ❌ Error: {str(e)}")
+    search_agent.flush_depth_stats()
     
     print()
     print(f"Total results: {len(all_results)}")
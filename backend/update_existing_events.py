@@ -7,7 +7,7 @@ from datetime import date, timedelta
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from database.client import DatabaseClient
+from database.client import get_db
 from agent.llm_processor import LLMProcessor
 from agent.url_follower import URLFollower
 from agent.translator import Translator
@@ -24,7 +24,7 @@ def update_events():
     print()
     
     try:
-        db_client = DatabaseClient()
+        db_client = get_db()
         llm_processor = LLMProcessor()
         url_follower = URLFollower()
         translator = Translator()